@@ -1,14 +1,175 @@
 # Program 2: Determine age category
 
-age = int(input("Enter your age: "))
-
-if age < 0:
-    print("Invalid age entered.")
-elif age <= 12:
-    print("You are a Child.")
-elif age <= 19:
-    print("You are a Teenager.")
-elif age <= 59:
-    print("You are an Adult.")
-else:
-    print("You are a Senior.")
+import argparse
+import json
+import sys
+from bisect import bisect_left
+
+import numpy as np
+
+from batch_utils import iter_chunks
+
+# Inclusive upper age of every category but the last
+DEFAULT_BREAKPOINTS = (12, 19, 59)
+DEFAULT_LABELS = ("Child", "Teenager", "Adult", "Senior")
+INVALID_LABEL = "Invalid"
+INVALID = -1
+
+class AgeBuckets:
+    """
+    Age categories defined by breakpoints and labels.
+
+    Ages up to and including breakpoints[i] get labels[i]; ages above the
+    last breakpoint get the last label. Negative, NaN and non-numeric ages
+    are invalid.
+    """
+
+    def __init__(self, breakpoints=DEFAULT_BREAKPOINTS, labels=DEFAULT_LABELS):
+        if len(labels) != len(breakpoints) + 1:
+            raise ValueError(f"Need {len(breakpoints) + 1} labels for {len(breakpoints)} breakpoints, got {len(labels)}")
+        if any(low >= high for low, high in zip(breakpoints, breakpoints[1:])):
+            raise ValueError("Breakpoints must be strictly increasing")
+
+        self.breakpoints = tuple(breakpoints)
+        self.labels = tuple(labels)
+        self._edges = np.asarray(breakpoints, dtype=np.float64)
+        # Index INVALID (-1) picks the last entry, so invalid rows need no special case
+        self._label_array = np.array(self.labels + (INVALID_LABEL,), dtype=object)
+
+    def classify(self, age):
+        """Return the label for one age"""
+        # Written as in bucket_indices so that NaN is invalid too
+        if not age >= 0:
+            return INVALID_LABEL
+        return self.labels[bisect_left(self.breakpoints, age)]
+
+    def bucket_indices(self, ages):
+        """
+        Classify a whole array of ages with one binary search per element in C.
+
+        Returns:
+            numpy.ndarray: int16 bucket index per age, INVALID for negative or NaN ages
+        """
+        ages = np.asarray(ages, dtype=np.float64)
+        indices = np.searchsorted(self._edges, ages, side="left").astype(np.int16)
+        indices[~(ages >= 0)] = INVALID
+        return indices
+
+    def labels_for(self, indices):
+        """Map bucket indices to label strings"""
+        return self._label_array[indices]
+
+    def histogram(self, indices):
+        """
+        Count ages per category.
+
+        Returns:
+            dict: label -> count, including INVALID_LABEL
+        """
+        counts = np.bincount(indices[indices != INVALID], minlength=len(self.labels))
+        histogram = dict(zip(self.labels, counts.tolist()))
+        histogram[INVALID_LABEL] = int(np.count_nonzero(indices == INVALID))
+        return histogram
+
+DEFAULT_AGE_BUCKETS = AgeBuckets()
+
+def describe_age(age, buckets=DEFAULT_AGE_BUCKETS):
+    """Return the message for one age, e.g. "You are an Adult." """
+    category = buckets.classify(age)
+    if category == INVALID_LABEL:
+        return "Invalid age entered."
+    return f"You are a{'n' if category[0] in 'AEIOU' else ''} {category}."
+
+def parse_ages(lines):
+    """
+    Convert text lines to a float array; lines that are not numbers become NaN.
+    """
+    try:
+        return np.array(lines).astype(np.float64)
+    except ValueError:
+        ages = np.empty(len(lines))
+        for i, line in enumerate(lines):
+            try:
+                ages[i] = float(line)
+            except ValueError:
+                ages[i] = np.nan
+        return ages
+
+def classify_file(path, buckets=None, output=None, chunk_size=1_000_000, max_reported=20):
+    """
+    Classify every age in a file (one per line) in vectorized chunks.
+
+    Ages may be integers or decimals. Blank lines are skipped, as in
+    BatchRunner, so rows are the non-blank lines of the file.
+
+    Args:
+        path (str): Text file of ages; .npy files are memory-mapped instead
+        buckets (AgeBuckets): Categories (default: Child/Teenager/Adult/Senior)
+        output: Optional text file that receives one label per input row
+        chunk_size (int): Rows classified at a time
+        max_reported (int): Invalid row numbers to list in the summary
+
+    Returns:
+        dict: rows, histogram, and the first invalid row numbers (1-based)
+    """
+    buckets = buckets or AgeBuckets()
+    totals = dict.fromkeys(buckets.labels + (INVALID_LABEL,), 0)
+    invalid_rows = []
+    rows = 0
+
+    if str(path).endswith(".npy"):
+        data = np.load(path, mmap_mode="r")
+        chunks = (data[start:start + chunk_size] for start in range(0, len(data), chunk_size))
+        source = None
+    else:
+        source = open(path)
+        stripped = (line.strip() for line in source)
+        chunks = (parse_ages(lines) for lines in iter_chunks((line for line in stripped if line), chunk_size))
+
+    try:
+        for ages in chunks:
+            indices = buckets.bucket_indices(ages)
+            for label, count in buckets.histogram(indices).items():
+                totals[label] += count
+            if len(invalid_rows) < max_reported:
+                found = np.flatnonzero(indices == INVALID)[:max_reported - len(invalid_rows)]
+                invalid_rows.extend((found + rows + 1).tolist())
+            if output is not None:
+                output.write("\n".join(buckets.labels_for(indices)) + "\n")
+            rows += len(ages)
+    finally:
+        if source:
+            source.close()
+
+    return {"rows": rows, "histogram": totals, "invalid_rows": invalid_rows}
+
+def run_bulk(argv=None):
+    """Command-line entry point for classifying a file of ages"""
+    parser = argparse.ArgumentParser(description="Classify a file of ages into categories")
+    parser.add_argument("--file", required=True, help="Ages, one per line (or a .npy array)")
+    parser.add_argument("--breakpoints", default=",".join(map(str, DEFAULT_BREAKPOINTS)),
+                        help="Comma-separated inclusive upper ages of each category but the last")
+    parser.add_argument("--labels", default=",".join(DEFAULT_LABELS), help="Comma-separated category labels")
+    parser.add_argument("--output", help="Write one label per row to this file")
+    args = parser.parse_args(argv)
+
+    buckets = AgeBuckets(
+        breakpoints=[float(value) for value in args.breakpoints.split(",")],
+        labels=args.labels.split(",")
+    )
+    if args.output:
+        with open(args.output, "w", buffering=1 << 20) as output:
+            summary = classify_file(args.file, buckets, output=output)
+    else:
+        summary = classify_file(args.file, buckets)
+    print(json.dumps(summary, indent=2))
+
+def main():
+    age = float(input("Enter your age: "))
+    print(describe_age(age))
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_bulk()
+    else:
+        main()
@@ -1,3 +1,56 @@
+import argparse
+import ast
+import csv
+import operator
+import sys
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+from batch_utils import iter_chunks
+
+OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv
+}
+
+DIVIDE_BY_ZERO = "Error: Cannot divide by zero!"
+INVALID_OPERATOR = "Invalid operator!"
+INVALID_NUMBER = "Invalid number!"
+MISSING_VALUE = "Missing value!"
+
+# AST node types an arithmetic expression may contain
+BINARY_OPERATORS = {ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/'}
+UNARY_OPERATORS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+def calculate(num1, operator_symbol, num2):
+    """
+    Perform one binary operation.
+
+    Args:
+        num1 (float): First number
+        operator_symbol (str): One of +, -, *, /
+        num2 (float): Second number
+
+    Returns:
+        tuple: (result, error) where exactly one is None
+    """
+    if operator_symbol not in OPERATORS:
+        return None, INVALID_OPERATOR
+    if operator_symbol == '/' and num2 == 0:
+        return None, DIVIDE_BY_ZERO
+    return OPERATORS[operator_symbol](num1, num2), None
+
+def format_calculation(num1, operator_symbol, num2):
+    """Return the calculator's message for one operation: the result line or the error"""
+    result, error = calculate(num1, operator_symbol, num2)
+    if error:
+        return error
+    return f"Result: {num1} {operator_symbol} {num2} = {result}"
+
 def calculator():
     print("Simple Calculator")
     print("Select operation:")
@@ -8,26 +61,296 @@ def calculator():
 
     # Get user input
     num1 = float(input("Enter first number: "))
-    operator = input("Enter operator (+, -, *, /): ")
+    operator_symbol = input("Enter operator (+, -, *, /): ")
     num2 = float(input("Enter second number: "))
 
     # Perform calculation
-    if operator == '+':
-        result = num1 + num2
-    elif operator == '-':
-        result = num1 - num2
-    elif operator == '*':
-        result = num1 * num2
-    elif operator == '/':
-        if num2 == 0:
-            print("Error: Cannot divide by zero!")
-            return
-        result = num1 / num2
-    else:
-        print("Invalid operator!")
-        return
+    print(format_calculation(num1, operator_symbol, num2))
+
+class CompiledExpression:
+    """
+    An arithmetic expression parsed and validated once, then evaluated many times.
+
+    Expressions may use numbers, variable names, parentheses, unary +/-
+    and the calculator's four operators, e.g. "(price - discount) * qty".
+
+    Attributes:
+        source (str): The expression text
+        variables (tuple): Variable names in order of first appearance
+    """
+
+    def __init__(self, source):
+        try:
+            tree = ast.parse(source.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression '{source}': {e.msg}") from None
+
+        positions = {}
+        for node in ast.walk(tree):
+            if isinstance(node, ast.BinOp) and type(node.op) not in BINARY_OPERATORS:
+                raise ValueError(f"{INVALID_OPERATOR} ({type(node.op).__name__} in '{source}')")
+            if isinstance(node, ast.UnaryOp) and type(node.op) not in UNARY_OPERATORS:
+                raise ValueError(f"{INVALID_OPERATOR} ({type(node.op).__name__} in '{source}')")
+            if isinstance(node, ast.Constant) and (isinstance(node.value, bool) or not isinstance(node.value, (int, float))):
+                raise ValueError(f"Only numbers are allowed, got {node.value!r} in '{source}'")
+            if not isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load,
+                                     *BINARY_OPERATORS, *UNARY_OPERATORS)):
+                raise ValueError(f"Unsupported syntax {type(node).__name__} in '{source}'")
+            if isinstance(node, ast.Name):
+                position = (node.lineno, node.col_offset)
+                positions[node.id] = min(position, positions.get(node.id, position))
+
+        self.source = source
+        self.variables = tuple(sorted(positions, key=positions.get))
+        self._code = compile(tree, f"<expression {source!r}>", "eval")
+        self._vector = self._build_vector(tree.body)
+
+    def __repr__(self):
+        return f"CompiledExpression({self.source!r})"
+
+    def evaluate(self, values):
+        """
+        Evaluate for one set of operands.
+
+        Args:
+            values (dict): Variable name -> number
+
+        Returns:
+            tuple: (result, error) where exactly one is None
+        """
+        try:
+            return eval(self._code, {"__builtins__": {}}, values), None
+        except ZeroDivisionError:
+            return None, DIVIDE_BY_ZERO
+        except NameError as e:
+            return None, f"{MISSING_VALUE} ({e.name})"
+
+    def evaluate_rows(self, rows, vectorized=False):
+        """
+        Evaluate over many operand rows; errors are reported per row.
+
+        Args:
+            rows (list): Dicts keyed by variable name, or sequences in the
+                order of self.variables
+            vectorized (bool): Evaluate whole columns with NumPy instead of
+                row by row
+
+        Returns:
+            list: (result, error) tuples, one per row
+        """
+        if not vectorized:
+            return [self.evaluate(row if isinstance(row, dict) else dict(zip(self.variables, row))) for row in rows]
+
+        if rows and isinstance(rows[0], dict):
+            incomplete = [i for i, row in enumerate(rows) if not all(name in row for name in self.variables)]
+            if incomplete:
+                # Evaluate the complete rows together and report the others one by one
+                outcomes = [self.evaluate(rows[i]) for i in incomplete]
+                skip = set(incomplete)
+                complete = [row for i, row in enumerate(rows) if i not in skip]
+                results = iter(self.evaluate_rows(complete, vectorized=True))
+                errors = dict(zip(incomplete, outcomes))
+                return [errors[i] if i in skip else next(results) for i in range(len(rows))]
+            columns = {name: [row[name] for row in rows] for name in self.variables}
+        else:
+            columns = {name: [row[i] for row in rows] for i, name in enumerate(self.variables)}
+        results, divide_by_zero = self.evaluate_columns(columns, size=len(rows))
+        return [
+            (None, DIVIDE_BY_ZERO) if failed else (result, None)
+            for result, failed in zip(results.tolist(), divide_by_zero.tolist())
+        ]
+
+    def evaluate_columns(self, columns, size=None):
+        """
+        Evaluate over whole operand columns in one vectorized pass.
+
+        Args:
+            columns (dict): Variable name -> array-like of numbers
+            size (int): Row count, needed only for constant expressions
 
-    print(f"Result: {num1} {operator} {num2} = {result}")
+        Returns:
+            tuple: (results, divide_by_zero) float64 and bool arrays; results
+                are NaN where divide_by_zero is True
+        """
+        arrays = {name: np.asarray(columns[name], dtype=np.float64) for name in self.variables}
+        if size is None:
+            size = len(next(iter(arrays.values()))) if arrays else 1
+        divide_by_zero = np.zeros(size, dtype=bool)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            results = np.broadcast_to(self._vector(arrays, divide_by_zero), (size,)).astype(np.float64)
+        results[divide_by_zero] = np.nan
+        return results, divide_by_zero
+
+    def _build_vector(self, node):
+        """Compile an AST node into a function of (columns, divide_by_zero mask)"""
+        if isinstance(node, ast.Constant):
+            # A NumPy scalar, so constant division by zero follows errstate instead of raising
+            value = np.float64(node.value)
+            return lambda columns, divide_by_zero: value
+        if isinstance(node, ast.Name):
+            name = node.id
+            return lambda columns, divide_by_zero: columns[name]
+        if isinstance(node, ast.UnaryOp):
+            operand = self._build_vector(node.operand)
+            apply = UNARY_OPERATORS[type(node.op)]
+            return lambda columns, divide_by_zero: apply(operand(columns, divide_by_zero))
+
+        left = self._build_vector(node.left)
+        right = self._build_vector(node.right)
+        apply = OPERATORS[BINARY_OPERATORS[type(node.op)]]
+        if isinstance(node.op, ast.Div):
+            def divide(columns, divide_by_zero):
+                denominator = right(columns, divide_by_zero)
+                divide_by_zero |= np.broadcast_to(denominator == 0, divide_by_zero.shape)
+                return apply(left(columns, divide_by_zero), denominator)
+            return divide
+        return lambda columns, divide_by_zero: apply(left(columns, divide_by_zero), right(columns, divide_by_zero))
+
+@lru_cache(maxsize=256)
+def compile_expression(source):
+    """
+    Parse and compile an expression, reusing earlier compilations.
+
+    Raises:
+        ValueError: If the expression is not valid arithmetic
+    """
+    return CompiledExpression(source)
+
+def evaluate_operations(rows, vectorized=False):
+    """
+    Evaluate (num1, operator, num2) rows, as the interactive calculator would.
+
+    Rows are grouped by operator and each group is evaluated with one
+    cached compiled expression. A bad operator or a division by zero is
+    reported for that row only.
+
+    Args:
+        rows (list): (num1, operator, num2) tuples
+        vectorized (bool): Evaluate each operator group with NumPy
+
+    Returns:
+        list: (result, error) tuples, one per row
+    """
+    if vectorized:
+        return _evaluate_operations_vectorized(rows)
+
+    results = [None] * len(rows)
+    groups = defaultdict(list)
+    for i, (num1, operator_symbol, num2) in enumerate(rows):
+        if operator_symbol in OPERATORS:
+            groups[operator_symbol].append(i)
+        else:
+            results[i] = (None, INVALID_OPERATOR)
+
+    for operator_symbol, indices in groups.items():
+        expression = compile_expression(f"num1 {operator_symbol} num2")
+        for i in indices:
+            results[i] = expression.evaluate({"num1": rows[i][0], "num2": rows[i][2]})
+    return results
+
+def _evaluate_operations_vectorized(rows):
+    count = len(rows)
+    num1 = np.fromiter((row[0] for row in rows), dtype=np.float64, count=count)
+    num2 = np.fromiter((row[2] for row in rows), dtype=np.float64, count=count)
+    symbols = np.array([row[1] for row in rows], dtype=object)
+    values = np.full(count, np.nan)
+    errors = np.full(count, INVALID_OPERATOR, dtype=object)
+
+    for operator_symbol in OPERATORS:
+        selected = np.flatnonzero(symbols == operator_symbol)
+        if not len(selected):
+            continue
+        expression = compile_expression(f"num1 {operator_symbol} num2")
+        results, divide_by_zero = expression.evaluate_columns({"num1": num1[selected], "num2": num2[selected]})
+        values[selected] = results
+        errors[selected] = None
+        errors[selected[divide_by_zero]] = DIVIDE_BY_ZERO
+
+    return [
+        (None, error) if error else (value, None)
+        for value, error in zip(values.tolist(), errors.tolist())
+    ]
+
+def _parse_numbers(values):
+    values = list(values)
+    # csv.DictReader fills the cells missing from a short row with None
+    if any(value is None or not value.strip() for value in values):
+        return None, MISSING_VALUE
+    try:
+        return [float(value) for value in values], None
+    except ValueError:
+        return None, INVALID_NUMBER
+
+def evaluate_file(path, expression=None, vectorized=False, chunk_size=100000):
+    """
+    Stream operand rows from a CSV file and evaluate them chunk by chunk.
+
+    Without an expression, each row is num1,operator,num2 (a leading
+    "num1,operator,num2" header is skipped). With an expression, the file
+    must have a header naming the expression's variables.
+
+    Yields:
+        tuple: (result, error) for each data row, in file order
+    """
+    compiled = compile_expression(expression) if expression else None
+
+    with open(path, newline="") as f:
+        if compiled:
+            reader = csv.DictReader(f)
+            missing = set(compiled.variables) - set(reader.fieldnames or [])
+            if missing:
+                raise ValueError(f"Missing column(s) for the expression: {', '.join(sorted(missing))}")
+        else:
+            reader = csv.reader(f)
+
+        for chunk in iter_chunks(reader, chunk_size):
+            outcomes = [None] * len(chunk)
+            parsed, indices = [], []
+            for i, row in enumerate(chunk):
+                if compiled:
+                    numbers, error = _parse_numbers(row[name] for name in compiled.variables)
+                elif len(row) == 3 and [cell.strip() for cell in row] == ["num1", "operator", "num2"]:
+                    continue
+                elif len(row) != 3:
+                    numbers, error = None, "Expected num1,operator,num2"
+                else:
+                    numbers, error = _parse_numbers((row[0], row[2]))
+                    if numbers:
+                        numbers = (numbers[0], row[1].strip(), numbers[1])
+
+                if error:
+                    outcomes[i] = (None, error)
+                else:
+                    parsed.append(numbers)
+                    indices.append(i)
+
+            if compiled:
+                evaluated = compiled.evaluate_rows(parsed, vectorized)
+            else:
+                evaluated = evaluate_operations(parsed, vectorized)
+            for i, outcome in zip(indices, evaluated):
+                outcomes[i] = outcome
+
+            # Header rows were skipped with `continue` and stay None
+            yield from (outcome for outcome in outcomes if outcome is not None)
+
+def run_batch(argv=None):
+    """Command-line entry point for evaluating a file of operand rows"""
+    parser = argparse.ArgumentParser(description="Evaluate arithmetic over a CSV file of operand rows")
+    parser.add_argument("file", help="CSV of num1,operator,num2 rows, or named columns with --expression")
+    parser.add_argument("--expression", help='Expression over the CSV columns, e.g. "(a + b) / c"')
+    parser.add_argument("--vectorized", action="store_true", help="Evaluate each chunk with NumPy")
+    args = parser.parse_args(argv)
+
+    writer = csv.writer(sys.stdout, lineterminator="\n")
+    writer.writerow(["result", "error"])
+    for chunk in iter_chunks(evaluate_file(args.file, args.expression, args.vectorized), 10000):
+        writer.writerows(("" if result is None else result, error or "") for result, error in chunk)
 
 # Run the calculator
-calculator()
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_batch()
+    else:
+        calculator()
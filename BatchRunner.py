@@ -0,0 +1,126 @@
+# Batch Runner : Drive the root-level scripts' logic over stdin or a file
+# instead of starting one interpreter per value.
+#
+# Usage:
+#   python BatchRunner.py age < ages.txt
+#   python BatchRunner.py calc --input operations.txt --output results.txt --workers 4
+#
+# Every non-blank input line produces exactly one output line, in input order. Lines
+# that cannot be parsed produce "Error: ..." and the run continues.
+
+import argparse
+import csv
+import importlib
+import sys
+from decimal import Decimal, InvalidOperation
+
+from batch_utils import iter_chunks, parallel_map
+
+def _run_age(module, line):
+    # Parsed like AgeCategory.classify_file: decimals are ages, "nan" is invalid
+    return module.describe_age(float(line))
+
+def _run_calc(module, line):
+    # "6 / 2" or "6,/,2"
+    parts = line.replace(",", " ").split()
+    if len(parts) != 3:
+        raise ValueError("expected: num1 operator num2")
+    return module.format_calculation(float(parts[0]), parts[1], float(parts[2]))
+
+def _run_parity(module, line):
+    number = int(line)
+    return f"{number} is {module.describe_parity(number)}"
+
+def _run_bill(module, line):
+    # "10, 20.50, 30; 18" -> item prices; tax percentage
+    prices, separator, tax_percent = line.partition(";")
+    if not separator:
+        raise ValueError("expected: price, price, ...; tax_percent")
+    try:
+        tax_percent = Decimal(tax_percent.strip())
+        items = [Decimal(price.strip()) for price in prices.split(",")]
+    except InvalidOperation:
+        raise ValueError("prices and tax percentage must be numbers") from None
+    return " | ".join(module.format_bill(*module.compute_bill(items, tax_percent), tax_percent))
+
+def _run_greet(module, line):
+    # "name,age,favorite_color" (CSV quoting allowed)
+    row = next(csv.reader([line]))
+    if len(row) != 3:
+        raise ValueError("expected: name,age,favorite_color")
+    return module.build_greeting(*(value.strip() for value in row))
+
+# Task name -> (module providing the logic, function of (module, line) -> output line)
+TASKS = {
+    "age": ("AgeCategory", _run_age),
+    "calc": ("BasicCalculator", _run_calc),
+    "parity": ("EvenOddChecker", _run_parity),
+    "bill": ("ShoppingBill", _run_bill),
+    "greet": ("PersonalGreeting", _run_greet)
+}
+
+_task = None
+
+def _init_worker(task_name):
+    """Import the task's module once per worker process"""
+    global _task
+    module_name, run = TASKS[task_name]
+    _task = (importlib.import_module(module_name), run)
+
+def _run_chunk(lines):
+    """Process a chunk of input lines; runs in a worker process"""
+    module, run = _task
+    results = []
+    for line in lines:
+        try:
+            results.append(run(module, line.strip()))
+        except Exception as e:
+            results.append(f"Error: {e}")
+    return "\n".join(results) + "\n"
+
+def run_batch(task_name, lines, output, workers=1, chunk_size=5000):
+    """
+    Run one task over every non-blank line and write one result line for each.
+
+    Args:
+        task_name (str): Key into TASKS
+        lines: Iterable of input lines (e.g. an open file)
+        output: Text file for the results
+        workers (int): Worker processes; 1 runs in this process
+        chunk_size (int): Lines handed to a worker per task
+
+    Returns:
+        int: Number of lines processed
+    """
+    if task_name not in TASKS:
+        raise ValueError(f"Unknown task '{task_name}'. Choose from: {', '.join(TASKS)}")
+
+    count = 0
+    chunks = iter_chunks((line for line in lines if line.strip()), chunk_size)
+    for text in parallel_map(_run_chunk, chunks, workers=workers,
+                             initializer=_init_worker, initargs=(task_name,)):
+        output.write(text)
+        count += text.count("\n")
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a root-level script's logic over many inputs")
+    parser.add_argument("task", choices=list(TASKS), help="Which script's logic to run")
+    parser.add_argument("--input", help="Input file, one value per line (default: stdin)")
+    parser.add_argument("--output", help="Output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0 for CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Lines per worker task")
+    args = parser.parse_args()
+
+    source = open(args.input) if args.input else sys.stdin
+    output = open(args.output, "w", buffering=1 << 20) if args.output else sys.stdout
+    try:
+        run_batch(args.task, source, output, workers=args.workers or None, chunk_size=args.chunk_size)
+    finally:
+        if args.input:
+            source.close()
+        if args.output:
+            output.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,24 @@
-from flask import Flask, request, jsonify
+import math
+import time
+from contextlib import contextmanager
+
+from flask import Flask, g, request, jsonify, url_for
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 from config import Config
+from compression import (
+    InvalidPayload, PayloadTooLarge, UnsupportedEncoding,
+    compress, decode_body, negotiate, supported_encodings
+)
+from jobs import JobQueue, JobStore, fingerprint
+from ratelimit import TokenBucketLimiter
+from tracing import Tracer, format_server_timing
 
 app = Flask(__name__)
 app.config.from_object(Config)
 
+# Endpoints that cost tokens; health checks, docs and job polling are free
+RATE_LIMITED_ENDPOINTS = {'count_numbers_api', 'submit_job'}
+
 def count_numbers(numbers):
     """
     Count positive, negative, and zero numbers in a list.
@@ -33,13 +48,147 @@ def count_numbers(numbers):
         'total': len(numbers)
     }
 
-@app.route('/count-numbers', methods=['GET'])
+def get_tracer():
+    """Create the tracer on first use, from the current app config"""
+    if 'tracer' not in app.extensions:
+        app.extensions['tracer'] = Tracer('countnumbers-api', app.config['TRACE_EXPORT_PATH'])
+    return app.extensions['tracer']
+
+@app.before_request
+def start_trace():
+    """Open the request's server span, continuing the caller's trace if it sent a traceparent"""
+    if not app.config['TRACING_ENABLED']:
+        return None
+    g.trace_span = get_tracer().start_span(
+        f"{request.method} {request.path}",
+        traceparent=request.headers.get('traceparent'),
+        kind='server',
+        attributes={'http.method': request.method, 'http.target': request.path}
+    )
+    g.trace_stages = []
+
+@contextmanager
+def trace_stage(name):
+    """Time one stage of the current request as a child of its server span"""
+    parent = g.get('trace_span')
+    if parent is None:
+        yield None
+        return
+    with get_tracer().span(name, parent=parent) as span:
+        yield span
+    g.trace_stages.append(span)
+
+@app.after_request
+def finish_trace(response):
+    """Close the server span and report the stage timings in Server-Timing"""
+    span = g.pop('trace_span', None)
+    if span is None:
+        return response
+    span.set_attribute('http.status_code', response.status_code)
+    span.end()
+    response.headers['Server-Timing'] = ', '.join(
+        filter(None, [format_server_timing(g.trace_stages), f"total;dur={span.duration_ms:.3f}"])
+    )
+    response.headers['traceresponse'] = span.traceparent
+    return response
+
+def get_rate_limiter():
+    """Open the shared token-bucket table on first use, from the current app config"""
+    if 'rate_limiter' not in app.extensions:
+        app.extensions['rate_limiter'] = TokenBucketLimiter(
+            app.config['RATE_LIMIT_PATH'],
+            rate=app.config['RATE_LIMIT_RATE'],
+            burst=app.config['RATE_LIMIT_BURST'],
+            slots=app.config['RATE_LIMIT_SLOTS']
+        )
+    return app.extensions['rate_limiter']
+
+def client_key():
+    """
+    Rate limit key: the X-API-Key header if it is in RATE_LIMIT_API_KEYS,
+    otherwise the client IP. Unlisted keys are ignored, so a client cannot
+    get a fresh bucket by sending a new key with every request.
+    """
+    api_key = request.headers.get('X-API-Key')
+    if api_key and api_key in app.config['RATE_LIMIT_API_KEYS']:
+        return f"key:{api_key}"
+    return f"ip:{request.remote_addr}"
+
+def rate_limited():
+    """Whether this request is subject to rate limiting"""
+    return (app.config['RATE_LIMIT_ENABLED']
+            and request.headers.get('X-API-Key') not in app.config['RATE_LIMIT_EXEMPT_KEYS'])
+
+def charge_rate_limit(extra_bytes):
+    """Take tokens for payload bytes found after the request was admitted"""
+    if extra_bytes > 0 and rate_limited():
+        get_rate_limiter().charge(client_key(), extra_bytes / app.config['RATE_LIMIT_BYTES_PER_TOKEN'])
+
+@app.before_request
+def enforce_rate_limit():
+    """Reject the request with 429 if the client's bucket cannot cover its cost"""
+    if request.endpoint not in RATE_LIMITED_ENDPOINTS or not rate_limited():
+        return None
+    
+    payload_size = request.content_length or len(request.query_string)
+    cost = 1 + payload_size / app.config['RATE_LIMIT_BYTES_PER_TOKEN']
+    with trace_stage('rate_limit'):
+        allowed, retry_after = get_rate_limiter().acquire(client_key(), cost)
+    if allowed:
+        return None
+    return jsonify({
+        'error': 'Rate limit exceeded',
+        'message': f'Too many requests or too much data; retry in {math.ceil(retry_after)} seconds'
+    }), 429, {'Retry-After': str(math.ceil(retry_after))}
+
+def parse_numbers(numbers_param):
+    """
+    Parse a comma-separated string of numbers.
+    
+    Raises:
+        ValueError: If any value is not a number
+    """
+    return [float(num.strip()) for num in numbers_param.split(',')]
+
+def read_numbers_param():
+    """
+    Get the comma-separated numbers from the query string or the request body.
+    
+    POST bodies may be plain text or JSON ({"numbers": "1,2,3"} or
+    {"numbers": [1, 2, 3]}) and may be compressed with any coding from
+    supported_encodings(), announced in Content-Encoding.
+    """
+    if request.method == 'GET':
+        return request.args.get('numbers', '')
+    
+    try:
+        body = decode_body(
+            request.stream,
+            request.headers.get('Content-Encoding'),
+            app.config['MAX_DECOMPRESSED_SIZE']
+        )
+    except RequestEntityTooLarge:
+        # Werkzeug enforces MAX_CONTENT_LENGTH on the raw body
+        raise PayloadTooLarge(f"Request body exceeds {app.config['MAX_CONTENT_LENGTH']} bytes") from None
+    # The limiter charged for the compressed size; charge for what it expanded to
+    charge_rate_limit(len(body) - (request.content_length or 0))
+    if request.mimetype == 'application/json':
+        numbers = request.json_module.loads(body).get('numbers', '')
+        return ','.join(map(str, numbers)) if isinstance(numbers, list) else str(numbers)
+    return body.decode('utf-8')
+
+@app.route('/count-numbers', methods=['GET', 'POST'])
 def count_numbers_api():
     """
     API endpoint to count positive, negative, and zero numbers.
     
     Query Parameters:
         numbers: Comma-separated list of numbers
+        echo: "false" to leave input_numbers out of the response
+    
+    Request Body (POST):
+        The same list as text/plain or JSON, optionally compressed
+        (Content-Encoding: gzip, deflate, and br/zstd when available)
         
     Example:
         GET /count-numbers?numbers=1,2,-3,0,5,-1,0
@@ -48,8 +197,25 @@ def count_numbers_api():
         JSON response with counts
     """
     try:
-        # Get numbers from query parameters
-        numbers_param = request.args.get('numbers', '')
+        # Get numbers from query parameters or the request body
+        try:
+            with trace_stage('read_body'):
+                numbers_param = read_numbers_param()
+        except PayloadTooLarge as e:
+            return jsonify({
+                'error': 'Payload too large',
+                'message': str(e)
+            }), 413
+        except UnsupportedEncoding as e:
+            return jsonify({
+                'error': 'Unsupported content encoding',
+                'message': str(e)
+            }), 415
+        except (InvalidPayload, UnicodeDecodeError, ValueError, AttributeError) as e:
+            return jsonify({
+                'error': 'Invalid request body',
+                'message': str(e)
+            }), 400
         
         if not numbers_param:
             return jsonify({
@@ -59,7 +225,8 @@ def count_numbers_api():
         
         # Parse numbers from string
         try:
-            numbers = [float(num.strip()) for num in numbers_param.split(',')]
+            with trace_stage('parse_numbers'):
+                numbers = parse_numbers(numbers_param)
         except ValueError:
             return jsonify({
                 'error': 'Invalid number format',
@@ -67,20 +234,163 @@ def count_numbers_api():
             }), 400
         
         # Count the numbers
-        result = count_numbers(numbers)
+        with trace_stage('count_numbers') as span:
+            result = count_numbers(numbers)
+            if span is not None:
+                span.set_attribute('numbers.count', len(numbers))
         
-        return jsonify({
-            'input_numbers': numbers,
-            'counts': result,
-            'status': 'success'
-        })
+        with trace_stage('serialize'):
+            if request.args.get('echo', 'true').lower() == 'false':
+                return jsonify({
+                    'counts': result,
+                    'status': 'success'
+                })
+            
+            return jsonify({
+                'input_numbers': numbers,
+                'counts': result,
+                'status': 'success'
+            })
         
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({
             'error': 'Internal server error',
             'message': str(e)
         }), 500
 
+def count_job(numbers_param, echo, traceparent=None, submitted_ns=None):
+    """
+    Parse and count one submission; runs on a job worker thread.
+    
+    When tracing is enabled the job continues the submitting request's
+    trace, and the stage durations (including time spent queued) are
+    returned in the result's timing_ms.
+    """
+    tracer = get_tracer() if app.config['TRACING_ENABLED'] else None
+    root = tracer.start_span('count_job', traceparent=traceparent, kind='consumer',
+                             start_ns=submitted_ns) if tracer else None
+    stages = []
+    
+    @contextmanager
+    def stage(name):
+        if root is None:
+            yield
+            return
+        with tracer.span(name, parent=root) as span:
+            yield
+        stages.append(span)
+    
+    if root is not None and submitted_ns:
+        stages.append(tracer.start_span('queue_wait', parent=root, start_ns=submitted_ns).end())
+    try:
+        try:
+            with stage('parse_numbers'):
+                numbers = parse_numbers(numbers_param)
+        except ValueError:
+            raise ValueError('Invalid number format: please ensure all values are valid numbers') from None
+        
+        with stage('count_numbers'):
+            result = {'counts': count_numbers(numbers), 'status': 'success'}
+    finally:
+        if root is not None:
+            root.end()
+    
+    if echo:
+        result['input_numbers'] = numbers
+    if root is not None:
+        result['timing_ms'] = {span.name: round(span.duration_ms, 3) for span in stages}
+        result['timing_ms']['total'] = round(root.duration_ms, 3)
+    return result
+
+def get_job_queue():
+    """Create the job queue on first use, from the current app config"""
+    if 'job_queue' not in app.extensions:
+        store = JobStore(app.config['JOBS_DB_PATH'], ttl=app.config['JOB_RESULT_TTL'])
+        app.extensions['job_queue'] = JobQueue(store, workers=app.config['JOB_WORKERS'])
+    return app.extensions['job_queue']
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Queue a count and return its job ID at once.
+    
+    The body is the same as for POST /count-numbers. Submitting the same
+    numbers again while the first job is queued, running or unexpired
+    returns the existing job.
+    
+    Returns:
+        202 with the job's status and its URL in Location
+    """
+    try:
+        numbers_param = read_numbers_param()
+    except PayloadTooLarge as e:
+        return jsonify({
+            'error': 'Payload too large',
+            'message': str(e)
+        }), 413
+    except UnsupportedEncoding as e:
+        return jsonify({
+            'error': 'Unsupported content encoding',
+            'message': str(e)
+        }), 415
+    except (InvalidPayload, UnicodeDecodeError, ValueError, AttributeError) as e:
+        return jsonify({
+            'error': 'Invalid request body',
+            'message': str(e)
+        }), 400
+    
+    if not numbers_param:
+        return jsonify({
+            'error': 'Missing numbers parameter',
+            'message': 'Please provide numbers as comma-separated values in the request body'
+        }), 400
+    
+    echo = request.args.get('echo', 'true').lower() != 'false'
+    span = g.get('trace_span')
+    job, created = get_job_queue().submit(
+        fingerprint(numbers_param, str(echo)), count_job, numbers_param, echo,
+        span.traceparent if span is not None else None, time.time_ns()
+    )
+    location = url_for('get_job', job_id=job['job_id'])
+    return jsonify(dict(job, deduplicated=not created, location=location)), 202, {'Location': location}
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Status of a submitted job, with its result once it has succeeded.
+    
+    Returns:
+        JSON job record, or 404 if the job is unknown or its result expired
+    """
+    job = get_job_queue().store.get(job_id)
+    if job is None:
+        return jsonify({
+            'error': 'Job not found',
+            'message': 'Unknown job ID, or its result has expired'
+        }), 404
+    return jsonify(job)
+
+@app.after_request
+def compress_response(response):
+    """Compress large responses with the best coding the client accepts"""
+    response.vary.add('Accept-Encoding')
+    if (response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.content_length is None
+            or response.content_length < app.config['COMPRESSION_MIN_SIZE']):
+        return response
+    
+    encoding = negotiate(request.headers.get('Accept-Encoding'))
+    if encoding is None:
+        return response
+    
+    with trace_stage('compress_response'):
+        response.set_data(compress(response.get_data(), encoding, app.config['COMPRESSION_LEVEL']))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -96,13 +406,25 @@ def home():
         'message': 'Number Counting API',
         'endpoints': {
             'count-numbers': {
-                'method': 'GET',
+                'method': 'GET, POST',
                 'description': 'Count positive, negative, and zero numbers',
                 'parameters': {
-                    'numbers': 'Comma-separated list of numbers'
+                    'numbers': 'Comma-separated list of numbers',
+                    'echo': 'Set to false to omit input_numbers from the response'
                 },
+                'body': 'POST the same list as text/plain or JSON, optionally with Content-Encoding',
+                'content_encodings': supported_encodings(),
                 'example': '/count-numbers?numbers=1,2,-3,0,5,-1,0'
             },
+            'jobs': {
+                'method': 'POST',
+                'description': 'Queue a count for a large input; returns a job ID immediately',
+                'body': 'Same as POST /count-numbers'
+            },
+            'jobs/<job_id>': {
+                'method': 'GET',
+                'description': 'Job status (queued, running, succeeded, failed) and result'
+            },
             'health': {
                 'method': 'GET',
                 'description': 'Health check endpoint'
@@ -0,0 +1,336 @@
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+from CountNumbers_Test import StreamlitTester
+from CountNumbers_TestRunner import BrowserPool
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000, 1000000]
+
+# Navigation Timing and Paint Timing entries for the current document, in ms
+NAVIGATION_TIMINGS_JS = """
+() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const paint = {};
+    for (const entry of performance.getEntriesByType('paint')) {
+        paint[entry.name] = entry.startTime;
+    }
+    return {
+        ttfb_ms: nav ? nav.responseStart - nav.requestStart : null,
+        dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+        load_event_ms: nav && nav.loadEventEnd > 0 ? nav.loadEventEnd : null,
+        first_paint_ms: paint['first-paint'] ?? null,
+        first_contentful_paint_ms: paint['first-contentful-paint'] ?? null,
+    };
+}
+"""
+
+def summarize(samples):
+    """
+    Summarize a list of timing samples.
+
+    Args:
+        samples (list): Numeric samples; None entries are ignored
+
+    Returns:
+        dict: count, median, p95 (nearest rank), mean, variance, stdev, min and max
+    """
+    values = sorted(value for value in samples if value is not None)
+    if not values:
+        return {"count": 0, "median": None, "p95": None, "mean": None,
+                "variance": None, "stdev": None, "min": None, "max": None}
+
+    return {
+        "count": len(values),
+        "median": statistics.median(values),
+        "p95": values[math.ceil(0.95 * len(values)) - 1],
+        "mean": statistics.fmean(values),
+        "variance": statistics.variance(values) if len(values) > 1 else 0.0,
+        "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+        "min": values[0],
+        "max": values[-1]
+    }
+
+def summarize_records(records):
+    """Summarize every numeric field across a list of per-iteration records"""
+    keys = sorted({key for record in records for key in record})
+    return {key: summarize([record.get(key) for record in records]) for key in keys}
+
+def generate_numbers(size, seed=0):
+    """Build a reproducible comma-separated input of `size` numbers"""
+    rng = random.Random(seed)
+    return ", ".join(str(rng.randint(-1000, 1000)) for _ in range(size))
+
+def git_revision():
+    """Return the current git commit, or None outside a work tree"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def _start_trace(context, trace_dir, name):
+    if trace_dir:
+        await context.tracing.start(name=name, screenshots=True, snapshots=True)
+
+async def _stop_trace(context, trace_dir, name):
+    if trace_dir:
+        await context.tracing.stop(path=os.path.join(trace_dir, f"{name}.zip"))
+
+async def _load_app(tester):
+    """Load the app and return wall-clock readiness plus browser timings"""
+    start_time = time.perf_counter()
+    await tester.navigate_to_app()
+    await tester.wait_for_streamlit_ready()
+    record = {"app_ready_s": time.perf_counter() - start_time}
+    record.update(await tester.page.evaluate(NAVIGATION_TIMINGS_JS))
+    return record
+
+async def measure_cold_loads(pool, streamlit_url, iterations, trace_dir=None):
+    """
+    Load the app in a brand-new context (empty cache) each iteration.
+
+    Returns:
+        tuple: (records of the successful loads, errors of the failed ones)
+    """
+    records = []
+    errors = []
+    for i in range(iterations):
+        context = await pool.new_context(i)
+        try:
+            if i == 0:
+                await _start_trace(context, trace_dir, "cold_1")
+            try:
+                tester = StreamlitTester(streamlit_url, page=await context.new_page())
+                records.append(await _load_app(tester))
+            except Exception as e:
+                errors.append(f"cold load {i + 1}: {e}")
+            if i == 0:
+                await _stop_trace(context, trace_dir, "cold_1")
+        finally:
+            await context.close()
+    return records, errors
+
+async def measure_warm_loads(pool, streamlit_url, iterations, trace_dir=None):
+    """
+    Reload the app in one primed context each iteration.
+
+    Returns:
+        tuple: (records of the successful loads, errors of the failed ones)
+    """
+    records = []
+    errors = []
+    context = await pool.new_context(0)
+    try:
+        tester = StreamlitTester(streamlit_url, page=await context.new_page())
+        # Prime the HTTP cache and the Streamlit session before measuring
+        try:
+            await _load_app(tester)
+        except Exception as e:
+            errors.append(f"warm-up load: {e}")
+
+        for i in range(iterations):
+            if i == 0:
+                await _start_trace(context, trace_dir, "warm_1")
+            try:
+                records.append(await _load_app(tester))
+            except Exception as e:
+                errors.append(f"warm load {i + 1}: {e}")
+            finally:
+                if i == 0:
+                    await _stop_trace(context, trace_dir, "warm_1")
+    finally:
+        await context.close()
+    return records, errors
+
+async def measure_input_scaling(pool, streamlit_url, sizes, iterations, trace_dir=None):
+    """
+    Measure submit-to-result latency for growing input sizes.
+
+    Returns:
+        list: One entry per size with the latency summary and any errors
+    """
+    scaling = []
+    context = await pool.new_context(0)
+    try:
+        tester = StreamlitTester(streamlit_url, page=await context.new_page())
+
+        for size in sizes:
+            numbers = generate_numbers(size)
+            # Allow roughly 1 s per 10k numbers on top of the default timeout
+            timeout = 15000 + size // 10
+            latencies = []
+            errors = []
+
+            for i in range(iterations):
+                try:
+                    await tester.navigate_to_app()
+                    await tester.wait_for_streamlit_ready()
+                    await tester.enter_numbers(numbers)
+                except Exception as e:
+                    errors.append(str(e))
+                    continue
+
+                trace_name = f"scaling_{size}" if i == 0 else None
+                if trace_name:
+                    await _start_trace(context, trace_dir, trace_name)
+                try:
+                    start_time = time.perf_counter()
+                    await tester.click_count_numbers_button()
+                    await tester.wait_for_results(timeout=timeout)
+                    latency = time.perf_counter() - start_time
+                    results = await tester.capture_results()
+                    if results["success"]:
+                        latencies.append(latency)
+                    else:
+                        errors.append(results["error"])
+                except Exception as e:
+                    errors.append(str(e))
+                finally:
+                    if trace_name:
+                        await _stop_trace(context, trace_dir, trace_name)
+
+            logger.info(f"Input size {size}: {len(latencies)}/{iterations} succeeded")
+            scaling.append({
+                "size": size,
+                "input_bytes": len(numbers),
+                "latency_s": summarize(latencies),
+                "errors": errors
+            })
+    finally:
+        await context.close()
+    return scaling
+
+async def run_benchmark(streamlit_url: str = "http://localhost:8501", iterations: int = 10,
+                        sizes=None, scaling_iterations: int = 3, trace_dir: str = None,
+                        headless: bool = True):
+    """
+    Run the cold, warm and input-scaling benchmark.
+
+    Args:
+        streamlit_url (str): URL of the running Streamlit app
+        iterations (int): Cold and warm page loads to measure
+        sizes (list): Input sizes for the scaling run (default: 10 .. 10^6)
+        scaling_iterations (int): Submissions measured per input size
+        trace_dir (str): If set, save a Playwright trace for the first
+            iteration of each phase into this directory
+        headless (bool): Run the browser headless
+
+    Returns:
+        dict: Report with metadata, summaries, raw samples and the errors of
+            failed cold and warm loads
+    """
+    sizes = DEFAULT_SIZES if sizes is None else sizes
+    if trace_dir:
+        os.makedirs(trace_dir, exist_ok=True)
+
+    async with BrowserPool(workers=1, headless=headless) as pool:
+        cold, cold_errors = await measure_cold_loads(pool, streamlit_url, iterations, trace_dir)
+        warm, warm_errors = await measure_warm_loads(pool, streamlit_url, iterations, trace_dir)
+        scaling = await measure_input_scaling(pool, streamlit_url, sizes, scaling_iterations, trace_dir)
+
+    return {
+        "metadata": {
+            "git_revision": git_revision(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "streamlit_url": streamlit_url,
+            "iterations": iterations,
+            "scaling_iterations": scaling_iterations,
+            "python": platform.python_version(),
+            "platform": platform.platform()
+        },
+        "cold": summarize_records(cold),
+        "warm": summarize_records(warm),
+        "scaling": scaling,
+        "samples": {"cold": cold, "warm": warm},
+        "errors": {"cold": cold_errors, "warm": warm_errors}
+    }
+
+def write_report(report, path):
+    """Write a benchmark report as JSON"""
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Benchmark report saved: {path}")
+
+def compare_reports(baseline, current):
+    """
+    Compare the medians of two reports.
+
+    Returns:
+        list: (metric, baseline median, current median, percent change) tuples
+    """
+    rows = []
+    for phase in ("cold", "warm"):
+        for metric, stats in current.get(phase, {}).items():
+            before = baseline.get(phase, {}).get(metric, {}).get("median")
+            after = stats.get("median")
+            if before and after is not None:
+                rows.append((f"{phase}.{metric}", before, after, (after - before) / before * 100))
+
+    baseline_scaling = {entry["size"]: entry for entry in baseline.get("scaling", [])}
+    for entry in current.get("scaling", []):
+        before = baseline_scaling.get(entry["size"], {}).get("latency_s", {}).get("median")
+        after = entry["latency_s"]["median"]
+        if before and after is not None:
+            rows.append((f"scaling.{entry['size']}", before, after, (after - before) / before * 100))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Streamlit UI end to end")
+    parser.add_argument("--url", default="http://localhost:8501", help="Streamlit app URL")
+    parser.add_argument("--iterations", type=int, default=10, help="Cold and warm loads to measure")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Input sizes for the scaling run")
+    parser.add_argument("--scaling-iterations", type=int, default=3, help="Submissions per input size")
+    parser.add_argument("--trace-dir", help="Directory for Playwright traces")
+    parser.add_argument("--output", default="benchmark_report.json", help="Where to write the JSON report")
+    parser.add_argument("--compare", help="Baseline report to compare medians against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(
+        streamlit_url=args.url,
+        iterations=args.iterations,
+        sizes=args.sizes,
+        scaling_iterations=args.scaling_iterations,
+        trace_dir=args.trace_dir
+    ))
+    write_report(report, args.output)
+
+    for phase in ("cold", "warm"):
+        stats = report[phase].get("app_ready_s")
+        errors = report["errors"][phase]
+        if stats and stats["count"]:
+            logger.info(f"{phase}: median {stats['median']:.3f}s, p95 {stats['p95']:.3f}s, "
+                        f"variance {stats['variance']:.5f}, {len(errors)} failed")
+        else:
+            logger.info(f"{phase}: no successful loads ({errors[0] if errors else 'no iterations'})")
+        for error in errors:
+            logger.warning(error)
+    for entry in report["scaling"]:
+        stats = entry["latency_s"]
+        if stats["count"]:
+            logger.info(f"{entry['size']:>8} numbers: median {stats['median']:.3f}s, p95 {stats['p95']:.3f}s")
+        else:
+            logger.info(f"{entry['size']:>8} numbers: failed ({entry['errors'][0] if entry['errors'] else 'no iterations'})")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for metric, before, after, change in compare_reports(baseline, report):
+            logger.info(f"{metric}: {before:.3f} -> {after:.3f} ({change:+.1f}%)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Scatter-gather coordinator: split one large counting job into shards, send
+them to several CountNumbers API workers at once and merge the counts.
+
+Failed shards are retried on a different worker, and a shard that is still
+running after `hedge_after` seconds is sent to a second worker as well; the
+first answer wins.
+
+Example with three local workers:
+    PORT=5001 python CountNumbers_API.py &
+    PORT=5002 python CountNumbers_API.py &
+    PORT=5003 python CountNumbers_API.py &
+    python CountNumbers_Coordinator.py --workers http://localhost:5001,http://localhost:5002,http://localhost:5003 \\
+        --file numbers.txt --shard-size 100000
+"""
+import argparse
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import requests
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+COUNT_KEYS = ('positive', 'negative', 'zero', 'total')
+
+class ShardFailed(Exception):
+    """A shard could not be counted by any worker"""
+
+class WorkerRejected(Exception):
+    """A worker refused a shard (4xx); sending it elsewhere will not help"""
+
+class WorkerThrottled(Exception):
+    """A worker rate-limited the coordinator (429); retry after `retry_after` seconds"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def split_shards(numbers, shard_size):
+    """
+    Split values into comma-separated request bodies of at most shard_size values.
+
+    Args:
+        numbers: Sequence of numbers or number strings
+        shard_size (int): Values per shard
+
+    Returns:
+        list: (body, value count) per shard
+    """
+    if shard_size < 1:
+        raise ValueError("shard_size must be at least 1")
+    return [
+        (','.join(map(str, numbers[start:start + shard_size])), len(numbers[start:start + shard_size]))
+        for start in range(0, len(numbers), shard_size)
+    ]
+
+def merge_counts(partials):
+    """Add up the counts returned for each shard"""
+    merged = dict.fromkeys(COUNT_KEYS, 0)
+    for counts in partials:
+        for key in COUNT_KEYS:
+            merged[key] += counts[key]
+    return merged
+
+class Coordinator:
+    """
+    Fan shards out to a list of worker base URLs and gather their counts.
+
+    Args:
+        workers (list): Worker base URLs, e.g. ["http://localhost:5001"]
+        shard_size (int): Values per shard
+        timeout (float): Per-request timeout in seconds
+        max_attempts (int): Requests (first try, retries and hedges) allowed per shard
+        hedge_after (float): Seconds before a slow shard is also sent to another worker;
+            None disables hedging
+        max_in_flight (int): Shards dispatched at once (default: 2 per worker)
+        api_key (str): Sent as X-API-Key, so workers can give the coordinator
+            its own rate limit or exempt it
+        max_throttle_wait (float): Total Retry-After seconds a shard may wait
+            on throttled (429) workers before the job fails
+    """
+
+    def __init__(self, workers, shard_size=100_000, timeout=10, max_attempts=3,
+                 hedge_after=2.0, max_in_flight=None, api_key=None, max_throttle_wait=60):
+        if not workers:
+            raise ValueError("At least one worker URL is required")
+        self.workers = [url.rstrip('/') for url in workers]
+        self.shard_size = shard_size
+        self.timeout = timeout
+        self.max_attempts = max(1, max_attempts)
+        self.hedge_after = hedge_after
+        self.max_in_flight = max_in_flight or 2 * len(self.workers)
+        self.api_key = api_key
+        self.max_throttle_wait = max_throttle_wait
+        self._local = threading.local()
+
+    def _session(self):
+        """One keep-alive session per dispatch thread"""
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def send_shard(self, worker, body, size):
+        """
+        Count one shard on one worker.
+
+        Returns:
+            dict: The worker's counts
+
+        Raises:
+            WorkerThrottled: If the worker answered 429
+            WorkerRejected: If the worker answered any other 4xx
+            requests.exceptions.RequestException: On network errors, timeouts and 5xx
+        """
+        headers = {'Content-Type': 'text/plain; charset=utf-8', 'Content-Encoding': 'gzip'}
+        if self.api_key:
+            headers['X-API-Key'] = self.api_key
+        response = self._session().post(
+            f"{worker}/count-numbers",
+            params={'echo': 'false'},
+            data=gzip.compress(body.encode('utf-8'), compresslevel=1),
+            headers=headers,
+            timeout=self.timeout
+        )
+        if response.status_code == 429:
+            try:
+                retry_after = float(response.headers.get('Retry-After', 1))
+            except ValueError:
+                retry_after = 1.0
+            raise WorkerThrottled(f"{worker} is rate limiting this client", retry_after)
+        if 400 <= response.status_code < 500:
+            raise WorkerRejected(f"{worker} rejected shard ({response.status_code}): {response.text[:200]}")
+        response.raise_for_status()
+        counts = response.json()['counts']
+        if counts['total'] != size:
+            raise requests.exceptions.RequestException(
+                f"{worker} counted {counts['total']} values, expected {size}"
+            )
+        return counts
+
+    def _pick_worker(self, tried, busy, throttled_until, now):
+        """
+        Least busy worker that is not throttled and has not tried this shard
+        yet (any unthrottled worker once all have); None if all are throttled.
+        """
+        available = [w for w in self.workers if throttled_until[w] <= now]
+        candidates = [w for w in available if w not in tried] or available
+        return min(candidates, key=lambda w: busy[w]) if candidates else None
+
+    def count(self, numbers):
+        """
+        Count numbers across the workers.
+
+        Args:
+            numbers: Sequence of numbers or number strings
+
+        Returns:
+            dict: Merged counts plus a 'stats' dict (shards, requests, retries, hedges, throttled, seconds)
+
+        Raises:
+            ShardFailed: If a shard failed on every attempt, was rejected as invalid,
+                or waited longer than max_throttle_wait on throttled workers
+        """
+        started = time.perf_counter()
+        shards = split_shards(numbers, self.shard_size)
+        results = [None] * len(shards)
+        attempts = [0] * len(shards)
+        throttle_wait = [0.0] * len(shards)
+        tried = [set() for _ in shards]
+        running = [0] * len(shards)
+        hedged = set()
+        busy = dict.fromkeys(self.workers, 0)
+        throttled_until = dict.fromkeys(self.workers, 0.0)
+        in_flight = {}
+        pending = deque(range(len(shards)))
+        stats = {'shards': len(shards), 'requests': 0, 'retries': 0, 'hedges': 0, 'throttled': 0}
+
+        executor = ThreadPoolExecutor(max_workers=2 * self.max_in_flight)
+
+        def launch(index):
+            """Send a shard to a worker; False if every worker is throttled right now"""
+            now = time.monotonic()
+            worker = self._pick_worker(tried[index], busy, throttled_until, now)
+            if worker is None:
+                return False
+            attempts[index] += 1
+            tried[index].add(worker)
+            running[index] += 1
+            busy[worker] += 1
+            stats['requests'] += 1
+            future = executor.submit(self.send_shard, worker, *shards[index])
+            in_flight[future] = (index, worker, now)
+            return True
+
+        try:
+            remaining = len(shards)
+            while remaining:
+                while pending and len(in_flight) < self.max_in_flight and launch(pending[0]):
+                    pending.popleft()
+
+                # Wake up for the earliest hedge deadline or the end of a throttle, if any.
+                # Only shards with an attempt left can be hedged, and not before some
+                # worker is unthrottled, so a past deadline never turns into a busy loop.
+                now = time.monotonic()
+                deadlines = []
+                if self.hedge_after is not None:
+                    unthrottled_at = min(throttled_until.values())
+                    deadlines.extend(
+                        max(launched + self.hedge_after, unthrottled_at)
+                        for index, _, launched in in_flight.values()
+                        if index not in hedged and results[index] is None
+                        and attempts[index] < self.max_attempts
+                    )
+                if pending and len(in_flight) < self.max_in_flight:
+                    deadlines.append(min(throttled_until.values()))
+                wait_for = max(0.0, min(deadlines) - now) if deadlines else None
+
+                if not in_flight:
+                    time.sleep(wait_for or 0)
+                    continue
+                done, _ = wait(in_flight, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    index, worker, _ = in_flight.pop(future)
+                    running[index] -= 1
+                    busy[worker] -= 1
+                    if results[index] is not None:
+                        continue  # the other copy of a hedged shard already answered
+                    try:
+                        results[index] = future.result()
+                        remaining -= 1
+                    except WorkerThrottled as e:
+                        # Back off this worker and hand the shard to another; a
+                        # throttled request does not use up one of the shard's attempts
+                        throttled_until[worker] = max(throttled_until[worker], time.monotonic() + e.retry_after)
+                        attempts[index] -= 1
+                        throttle_wait[index] += e.retry_after
+                        stats['throttled'] += 1
+                        if running[index]:
+                            continue
+                        if throttle_wait[index] > self.max_throttle_wait:
+                            raise ShardFailed(
+                                f"Shard {index} was throttled for over {self.max_throttle_wait} seconds: {e}"
+                            ) from None
+                        pending.appendleft(index)
+                    except WorkerRejected as e:
+                        raise ShardFailed(f"Shard {index}: {e}") from None
+                    except Exception as e:
+                        logger.warning(f"Shard {index} failed on {worker}: {e}")
+                        if running[index]:
+                            continue  # a hedge for this shard is still running
+                        if attempts[index] >= self.max_attempts:
+                            raise ShardFailed(f"Shard {index} failed after {attempts[index]} attempt(s): {e}") from None
+                        stats['retries'] += 1
+                        pending.appendleft(index)
+
+                if self.hedge_after is not None:
+                    now = time.monotonic()
+                    for index, _, launched in list(in_flight.values()):
+                        if (index not in hedged and results[index] is None
+                                and now - launched >= self.hedge_after
+                                and attempts[index] < self.max_attempts
+                                and launch(index)):
+                            hedged.add(index)
+                            stats['hedges'] += 1
+        finally:
+            # Losing hedges and abandoned requests finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        merged = merge_counts(results)
+        stats['seconds'] = round(time.perf_counter() - started, 3)
+        merged['stats'] = stats
+        return merged
+
+def read_numbers(path):
+    """Read numbers from a file, one per line or comma-separated"""
+    with open(path) as f:
+        return [value.strip() for line in f for value in line.split(',') if value.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Count numbers across several CountNumbers API workers")
+    parser.add_argument("--workers", required=True, help="Comma-separated worker base URLs")
+    parser.add_argument("--file", required=True, help="Numbers, one per line or comma-separated")
+    parser.add_argument("--shard-size", type=int, default=100_000, help="Values per shard")
+    parser.add_argument("--timeout", type=float, default=10, help="Per-request timeout in seconds")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Requests allowed per shard")
+    parser.add_argument("--hedge-after", type=float, default=2.0,
+                        help="Seconds before a slow shard is duplicated on another worker (0 disables)")
+    parser.add_argument("--api-key", default=os.environ.get("COORDINATOR_API_KEY"),
+                        help="X-API-Key sent to the workers (default: $COORDINATOR_API_KEY); list it in the "
+                             "workers' RATE_LIMIT_EXEMPT_KEYS so shards are not throttled")
+    args = parser.parse_args()
+
+    coordinator = Coordinator(
+        args.workers.split(','),
+        shard_size=args.shard_size,
+        timeout=args.timeout,
+        max_attempts=args.max_attempts,
+        hedge_after=args.hedge_after or None,
+        api_key=args.api_key
+    )
+    print(json.dumps(coordinator.count(read_numbers(args.file)), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Scatter-gather coordinator tests.
+
+Unlike the fast tier these start API workers on loopback ports chosen by
+the OS, so they are marked `network`. Skip them with:
+    python -m pytest -q -m "not network"
+
+Most workers are threaded servers inside the test process, so a test can
+wrap the app to stall, fail or throttle requests; they share this
+process's `app`, config and rate limiter. test_coordinator_with_worker_processes
+runs the coordinator against separate CountNumbers_API.py processes.
+"""
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from werkzeug.serving import make_server
+
+import CountNumbers_Coordinator
+from CountNumbers_API import app
+from CountNumbers_Coordinator import Coordinator, ShardFailed, split_shards
+
+pytestmark = pytest.mark.network
+
+NUMBERS = [i - 500 for i in range(1000)]
+EXPECTED = {"positive": 499, "negative": 500, "zero": 1, "total": 1000}
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(monkeypatch):
+    monkeypatch.setitem(app.config, "RATE_LIMIT_ENABLED", False)
+
+@pytest.fixture
+def release():
+    """Set at teardown so stalled workers return instead of holding shutdown up"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+@pytest.fixture
+def start_worker():
+    """Serve a WSGI app on a free loopback port; returns its base URL"""
+    servers = []
+
+    def start(wsgi_app=app):
+        server = make_server("127.0.0.1", 0, wsgi_app, threaded=True)
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+@pytest.fixture
+def start_worker_process(tmp_path):
+    """Run CountNumbers_API.py in its own process on a free loopback port; returns its base URL"""
+    processes = []
+
+    def start():
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        env = dict(os.environ, PORT=str(port), DEBUG="false", RATE_LIMIT_ENABLED="false",
+                   JOBS_DB_PATH=str(tmp_path / f"jobs-{port}.sqlite3"))
+        process = subprocess.Popen([sys.executable, "CountNumbers_API.py"], env=env,
+                                   cwd=os.path.dirname(os.path.abspath(__file__)),
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        processes.append(process)
+
+        deadline = time.monotonic() + 15
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                return f"http://127.0.0.1:{port}"
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"API worker on port {port} did not start")
+                time.sleep(0.05)
+
+    yield start
+    for process in processes:
+        process.terminate()
+        process.wait(10)
+
+def broken_worker(environ, start_response):
+    start_response("503 Service Unavailable", [("Content-Type", "text/plain")])
+    return [b"unavailable"]
+
+def stalled_worker(release):
+    """A worker that answers only once the test is over"""
+    def wsgi_app(environ, start_response):
+        release.wait(10)
+        return app(environ, start_response)
+    return wsgi_app
+
+def slow_worker(delay):
+    """A worker that takes `delay` seconds per request"""
+    def wsgi_app(environ, start_response):
+        time.sleep(delay)
+        return app(environ, start_response)
+    return wsgi_app
+
+def throttling_worker(times):
+    """A worker that answers 429 to its first `times` requests"""
+    remaining = [times]
+
+    def wsgi_app(environ, start_response):
+        if remaining[0] > 0:
+            remaining[0] -= 1
+            start_response("429 Too Many Requests", [("Content-Type", "application/json"), ("Retry-After", "0.05")])
+            return [b'{"error": "Rate limit exceeded"}']
+        return app(environ, start_response)
+    return wsgi_app
+
+def counts_only(result):
+    return {key: result[key] for key in EXPECTED}
+
+def test_split_shards():
+    assert split_shards([1, 2, 3, 4, 5], 2) == [("1,2", 2), ("3,4", 2), ("5", 1)]
+    assert split_shards([], 2) == []
+
+def test_coordinator_merges_shards(start_worker):
+    workers = [start_worker(), start_worker()]
+    result = Coordinator(workers, shard_size=100).count(NUMBERS)
+
+    assert counts_only(result) == EXPECTED
+    assert result["stats"]["shards"] == 10
+    assert result["stats"]["retries"] == 0
+
+def test_coordinator_with_worker_processes(start_worker_process):
+    workers = [start_worker_process(), start_worker_process()]
+    result = Coordinator(workers, shard_size=100).count(NUMBERS)
+
+    assert counts_only(result) == EXPECTED
+    assert result["stats"]["shards"] == 10
+
+def test_coordinator_reassigns_failed_shards(start_worker):
+    workers = [start_worker(broken_worker), start_worker(), "http://127.0.0.1:9"]
+    result = Coordinator(workers, shard_size=100, timeout=2).count(NUMBERS)
+
+    assert counts_only(result) == EXPECTED
+    assert result["stats"]["retries"] > 0
+
+def test_coordinator_hedges_stragglers(start_worker, release):
+    workers = [start_worker(stalled_worker(release)), start_worker()]
+    result = Coordinator(workers, shard_size=500, hedge_after=0.05, max_in_flight=2).count(NUMBERS)
+
+    # The stalled worker never answers while the job runs, so its shard finished only via a hedge
+    assert counts_only(result) == EXPECTED
+    assert result["stats"]["hedges"] >= 1
+
+def test_coordinator_waits_for_unhedgeable_shards(start_worker, monkeypatch):
+    calls = []
+    real_wait = CountNumbers_Coordinator.wait
+
+    def counting_wait(*args, **kwargs):
+        calls.append(kwargs.get("timeout"))
+        return real_wait(*args, **kwargs)
+
+    monkeypatch.setattr(CountNumbers_Coordinator, "wait", counting_wait)
+    result = Coordinator([start_worker(slow_worker(0.5))], shard_size=1000,
+                         max_attempts=1, hedge_after=0.05).count(NUMBERS)
+
+    # With its only attempt in flight the shard cannot be hedged, so the
+    # coordinator blocks until the answer instead of polling a past deadline
+    assert counts_only(result) == EXPECTED
+    assert result["stats"]["hedges"] == 0
+    assert len(calls) <= 2
+
+def test_coordinator_retries_throttled_shards(start_worker):
+    workers = [start_worker(throttling_worker(3)), start_worker(throttling_worker(2))]
+    result = Coordinator(workers, shard_size=100, max_attempts=1).count(NUMBERS)
+
+    assert counts_only(result) == EXPECTED
+    assert result["stats"]["throttled"] == 5
+
+def test_coordinator_exempt_from_rate_limit(start_worker, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setitem(app.config, "RATE_LIMIT_PATH", str(tmp_path / "buckets"))
+    monkeypatch.setitem(app.config, "RATE_LIMIT_BURST", 1)
+    monkeypatch.setitem(app.config, "RATE_LIMIT_EXEMPT_KEYS", frozenset({"coordinator-key"}))
+    app.extensions.pop("rate_limiter", None)
+    try:
+        result = Coordinator([start_worker()], shard_size=100, api_key="coordinator-key").count(NUMBERS)
+    finally:
+        app.extensions.pop("rate_limiter", None)
+
+    assert counts_only(result) == EXPECTED
+    assert result["stats"]["throttled"] == 0
+
+def test_coordinator_gives_up(start_worker):
+    with pytest.raises(ShardFailed):
+        Coordinator([start_worker(broken_worker)], shard_size=500, max_attempts=2).count(NUMBERS)
+    with pytest.raises(ShardFailed, match="rejected"):
+        Coordinator([start_worker()]).count(["1", "x"])
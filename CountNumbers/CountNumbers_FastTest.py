@@ -0,0 +1,392 @@
+"""
+Fast, network-free test tier.
+
+The Flask app is exercised through its in-process test client and the
+Streamlit script through streamlit.testing's AppTest, with requests.get
+routed to the same test client. No server, browser or socket is needed.
+
+Run from this directory:
+    python -m pytest -q
+"""
+import gzip
+import json
+import time
+from unittest import mock
+from urllib.parse import urlsplit
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from CountNumbers_API import app, count_numbers
+from compression import negotiate
+from ratelimit import TokenBucketLimiter
+from tracing import parse_server_timing, parse_traceparent
+
+UI_SCRIPT = "CountNumbers_UI.py"
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(monkeypatch):
+    """Rate limiting is off unless a test turns it on with its own table"""
+    monkeypatch.setitem(app.config, "RATE_LIMIT_ENABLED", False)
+
+@pytest.fixture
+def rate_limited(client, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setitem(app.config, "RATE_LIMIT_PATH", str(tmp_path / "buckets"))
+    monkeypatch.setitem(app.config, "RATE_LIMIT_RATE", 1)
+    monkeypatch.setitem(app.config, "RATE_LIMIT_BURST", 5)
+    monkeypatch.setitem(app.config, "RATE_LIMIT_BYTES_PER_TOKEN", 1000)
+    monkeypatch.setitem(app.config, "RATE_LIMIT_API_KEYS", frozenset({"other", "bulk", "gzip"}))
+    monkeypatch.setitem(app.config, "RATE_LIMIT_EXEMPT_KEYS", frozenset({"coordinator"}))
+    app.extensions.pop("rate_limiter", None)
+    yield client
+    limiter = app.extensions.pop("rate_limiter", None)
+    if limiter is not None:
+        limiter.close()
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    """Export spans from both the API and the UI to one JSON lines file"""
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("TRACE_EXPORT_PATH", str(path))
+    monkeypatch.setitem(app.config, "TRACE_EXPORT_PATH", str(path))
+    app.extensions.pop("tracer", None)
+    yield path
+    app.extensions.pop("tracer", None)
+
+def read_spans(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+@pytest.fixture
+def client():
+    app.config.update(TESTING=True)
+    return app.test_client()
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response backed by a Flask test response"""
+
+    def __init__(self, flask_response):
+        self.status_code = flask_response.status_code
+        self.headers = dict(flask_response.headers)
+        self._json = flask_response.get_json(silent=True)
+
+    def json(self):
+        return self._json
+
+@pytest.fixture
+def api_via_test_client(client):
+    """Route the UI's requests.get calls to the in-process Flask app"""
+    def fake_get(url, params=None, headers=None, timeout=None, **kwargs):
+        return FakeResponse(client.get(urlsplit(url).path, query_string=params, headers=headers))
+
+    with mock.patch("requests.get", side_effect=fake_get) as patched:
+        yield patched
+
+def fake_post(client):
+    """A requests.post replacement that sends the body to the in-process Flask app"""
+    def post(url, data=None, headers=None, timeout=None, **kwargs):
+        return FakeResponse(client.post(urlsplit(url).path, data=data, headers=headers))
+    return post
+
+@pytest.fixture
+def jobs(client, tmp_path, monkeypatch):
+    """Give the job queue a fresh SQLite file for each test"""
+    monkeypatch.setitem(app.config, "JOBS_DB_PATH", str(tmp_path / "jobs.sqlite3"))
+    app.extensions.pop("job_queue", None)
+    yield client
+    app.extensions.pop("job_queue").shutdown()
+
+def wait_for_job(client, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/jobs/{job_id}").get_json()
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+def submit(at, numbers):
+    """Fill the form and press 'Count Numbers'"""
+    at.text_area[0].input(numbers)
+    next(button for button in at.button if "Count Numbers" in button.label).click()
+    return at.run()
+
+# --- count_numbers ---
+
+@pytest.mark.parametrize("numbers, expected", [
+    ([1, 2, -3, 0, 5, -1, 0], {"positive": 3, "negative": 2, "zero": 2, "total": 7}),
+    ([], {"positive": 0, "negative": 0, "zero": 0, "total": 0}),
+    ([-0.5, 0.0, 3.14], {"positive": 1, "negative": 1, "zero": 1, "total": 3}),
+])
+def test_count_numbers(numbers, expected):
+    assert count_numbers(numbers) == expected
+
+# --- Flask API ---
+
+def test_count_numbers_endpoint(client):
+    response = client.get("/count-numbers", query_string={"numbers": "1,2,-3,0,5,-1,0"})
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["status"] == "success"
+    assert data["input_numbers"] == [1, 2, -3, 0, 5, -1, 0]
+    assert data["counts"] == {"positive": 3, "negative": 2, "zero": 2, "total": 7}
+
+@pytest.mark.parametrize("query, error", [
+    ({}, "Missing numbers parameter"),
+    ({"numbers": "a,b,c"}, "Invalid number format"),
+])
+def test_count_numbers_endpoint_errors(client, query, error):
+    response = client.get("/count-numbers", query_string=query)
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == error
+
+def test_count_numbers_gzip_body(client):
+    body = ",".join(str(i - 500) for i in range(1000))
+    response = client.post("/count-numbers", data=gzip.compress(body.encode()),
+                           headers={"Content-Encoding": "gzip", "Content-Type": "text/plain"})
+
+    assert response.status_code == 200
+    assert response.get_json()["counts"] == {"positive": 499, "negative": 500, "zero": 1, "total": 1000}
+
+def test_count_numbers_json_body(client):
+    response = client.post("/count-numbers", json={"numbers": [1, -2, 0]})
+
+    assert response.get_json()["counts"] == {"positive": 1, "negative": 1, "zero": 1, "total": 3}
+
+@pytest.mark.parametrize("data, encoding, status", [
+    (gzip.compress(b"0," * (1 << 20)), "gzip", 413),
+    (b"0," * (1 << 19), "identity", 413),  # over MAX_CONTENT_LENGTH only
+    (b"1,2,3", "lzma", 415),
+    (b"not gzip", "gzip", 400),
+])
+def test_count_numbers_body_errors(client, monkeypatch, data, encoding, status):
+    monkeypatch.setitem(app.config, "MAX_DECOMPRESSED_SIZE", 1 << 20)
+    monkeypatch.setitem(app.config, "MAX_CONTENT_LENGTH", 1 << 19)
+    response = client.post("/count-numbers", data=data, headers={"Content-Encoding": encoding})
+
+    assert response.status_code == status
+    assert response.get_json()["error"]
+
+def test_response_compressed_above_threshold(client):
+    numbers = ",".join(["1"] * 500)
+    response = client.get("/count-numbers", query_string={"numbers": numbers},
+                          headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert json.loads(gzip.decompress(response.data))["counts"]["total"] == 500
+
+    small = client.get("/count-numbers", query_string={"numbers": "1,2"}, headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("gzip", "gzip"),
+    ("gzip;q=0.5, deflate", "deflate"),
+    ("gzip;q=0, deflate;q=0", None),
+    ("identity", None),
+])
+def test_negotiate(header, expected):
+    assert negotiate(header) == expected
+
+def test_count_numbers_without_echo(client):
+    data = client.get("/count-numbers", query_string={"numbers": "1,-1", "echo": "false"}).get_json()
+
+    assert "input_numbers" not in data
+    assert data["counts"]["total"] == 2
+
+def test_health_and_docs(client):
+    assert client.get("/health").get_json()["status"] == "healthy"
+    assert "count-numbers" in client.get("/").get_json()["endpoints"]
+
+# --- Tracing ---
+
+@pytest.mark.parametrize("header, expected", [
+    ("00-" + "a" * 32 + "-" + "b" * 16 + "-01", ("a" * 32, "b" * 16)),
+    ("00-" + "0" * 32 + "-" + "b" * 16 + "-01", None),
+    ("garbage", None),
+    (None, None),
+])
+def test_parse_traceparent(header, expected):
+    assert parse_traceparent(header) == expected
+
+def test_api_continues_trace(client, trace_file):
+    traceparent = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+    response = client.get("/count-numbers?numbers=1,2", headers={"traceparent": traceparent})
+
+    timings = parse_server_timing(response.headers["Server-Timing"])
+    assert {"read_body", "parse_numbers", "count_numbers", "serialize", "total"} <= set(timings)
+    spans = {span["name"]: span for span in read_spans(trace_file)}
+    server = spans["GET /count-numbers"]
+    assert server["traceId"] == "a" * 32
+    assert server["parentSpanId"] == "b" * 16
+    assert spans["count_numbers"]["parentSpanId"] == server["spanId"]
+    assert response.headers["traceresponse"] == f"00-{'a' * 32}-{server['spanId']}-01"
+
+# --- Rate limiting ---
+
+def test_rate_limit_per_client(rate_limited):
+    statuses = [rate_limited.get("/count-numbers?numbers=1").status_code for _ in range(7)]
+    assert statuses[:4] == [200] * 4
+    assert statuses[-1] == 429
+
+    limited = rate_limited.get("/count-numbers?numbers=1")
+    assert int(limited.headers["Retry-After"]) >= 1
+    assert rate_limited.get("/health").status_code == 200
+    assert rate_limited.get("/count-numbers?numbers=1", headers={"X-API-Key": "other"}).status_code == 200
+
+def test_rate_limit_ignores_unlisted_keys(rate_limited):
+    # Rotating made-up keys does not buy fresh buckets: they all share the IP's bucket
+    statuses = [
+        rate_limited.get("/count-numbers?numbers=1", headers={"X-API-Key": f"rotating-{i}"}).status_code
+        for i in range(7)
+    ]
+    assert statuses[-1] == 429
+    assert rate_limited.get("/count-numbers?numbers=1").status_code == 429
+
+def test_rate_limit_exempt_key(rate_limited):
+    statuses = {
+        rate_limited.get("/count-numbers?numbers=1", headers={"X-API-Key": "coordinator"}).status_code
+        for _ in range(10)
+    }
+    assert statuses == {200}
+
+def test_rate_limit_weighted_by_payload(rate_limited):
+    headers = {"X-API-Key": "bulk", "Content-Type": "text/plain"}
+    assert rate_limited.post("/count-numbers", data="1," * 4000 + "1", headers=headers).status_code == 200
+    # The oversized request was admitted on a full bucket and left it in debt
+    assert rate_limited.post("/count-numbers", data="1", headers=headers).status_code == 429
+
+def test_rate_limit_charges_decompressed_size(rate_limited):
+    headers = {"X-API-Key": "gzip", "Content-Type": "text/plain", "Content-Encoding": "gzip"}
+    assert rate_limited.post("/count-numbers", data=gzip.compress(b"0," * 5000 + b"0"), headers=headers).status_code == 200
+    assert rate_limited.post("/count-numbers", data="1", headers={"X-API-Key": "gzip"}).status_code == 429
+
+def test_token_buckets_shared_between_instances(tmp_path):
+    path = str(tmp_path / "buckets")
+    first = TokenBucketLimiter(path, rate=0.001, burst=3)
+    second = TokenBucketLimiter(path, rate=0.001, burst=3, slots=16)
+
+    assert first.acquire("client", 2)[0]
+    assert not second.acquire("client", 2)[0]
+    assert second.slots == first.slots
+    first.close()
+    second.close()
+
+# --- Background jobs ---
+
+def test_job_runs_in_background(jobs):
+    response = jobs.post("/jobs?echo=false", data="1,2,-3,0", content_type="text/plain")
+
+    assert response.status_code == 202
+    submitted = response.get_json()
+    assert response.headers["Location"] == f"/jobs/{submitted['job_id']}"
+    job = wait_for_job(jobs, submitted["job_id"])
+    assert job["status"] == "succeeded"
+    assert job["result"]["counts"] == {"positive": 2, "negative": 1, "zero": 1, "total": 4}
+    assert "input_numbers" not in job["result"]
+
+def test_identical_jobs_are_deduplicated(jobs):
+    first = jobs.post("/jobs", data="1,2,3", content_type="text/plain").get_json()
+    wait_for_job(jobs, first["job_id"])
+    second = jobs.post("/jobs", data=gzip.compress(b"1,2,3"),
+                       headers={"Content-Encoding": "gzip", "Content-Type": "text/plain"}).get_json()
+    other = jobs.post("/jobs", data="1,2,4", content_type="text/plain").get_json()
+
+    assert second["job_id"] == first["job_id"]
+    assert second["deduplicated"] and second["status"] == "succeeded"
+    assert other["job_id"] != first["job_id"]
+
+def test_job_results_expire(jobs, monkeypatch):
+    monkeypatch.setitem(app.config, "JOB_RESULT_TTL", 0)
+    job_id = jobs.post("/jobs", data="1", content_type="text/plain").get_json()["job_id"]
+    deadline = time.monotonic() + 5
+    while jobs.get(f"/jobs/{job_id}").status_code != 404:
+        assert time.monotonic() < deadline, "finished job did not expire"
+        time.sleep(0.01)
+
+    assert jobs.post("/jobs", data="1", content_type="text/plain").get_json()["job_id"] != job_id
+
+def test_failed_job_reports_error(jobs):
+    job_id = jobs.post("/jobs", data="1,x", content_type="text/plain").get_json()["job_id"]
+    job = wait_for_job(jobs, job_id)
+
+    assert job["status"] == "failed"
+    assert "Invalid number format" in job["error"]
+    assert jobs.get("/jobs/unknown").status_code == 404
+
+# --- Streamlit UI ---
+
+def test_ui_renders():
+    at = AppTest.from_file(UI_SCRIPT).run()
+
+    assert not at.exception
+    assert at.title[0].value == "🔢 Number Counter API Client"
+    assert len(at.text_area) == 1
+
+def test_ui_counts_numbers(api_via_test_client):
+    at = submit(AppTest.from_file(UI_SCRIPT).run(), "1, 2, -3, 0, 5, -1, 0")
+
+    assert not at.exception
+    metrics = {metric.label: metric.value for metric in at.metric}
+    assert metrics["🟢 Positive Numbers"] == "3"
+    assert metrics["🔴 Negative Numbers"] == "2"
+    assert metrics["⚫ Zero Numbers"] == "2"
+    assert metrics["📈 Total Numbers"] == "7"
+    assert api_via_test_client.call_count == 1
+
+def test_ui_sends_large_input_compressed(client, api_via_test_client):
+    numbers = ", ".join(str(i - 500) for i in range(1000))
+    with mock.patch("requests.post", side_effect=fake_post(client)) as post:
+        at = submit(AppTest.from_file(UI_SCRIPT).run(), numbers)
+
+    assert not at.exception
+    assert post.call_count == 1
+    assert api_via_test_client.call_count == 0
+    metrics = {metric.label: metric.value for metric in at.metric}
+    assert metrics["📈 Total Numbers"] == "1000"
+
+def test_ui_trace_and_timing_panel(api_via_test_client, trace_file):
+    at = AppTest.from_file(UI_SCRIPT).run()
+    at.sidebar.checkbox[0].check()
+    at = submit(at.run(), "1, -1, 0")
+
+    assert not at.exception
+    stages = list(at.table[0].value["Stage"])
+    assert stages[:3] == ["streamlit_rerun", "validate_numbers", "call_api"]
+    assert "  server: count_numbers" in stages and stages[-2:] == ["display_results", "total"]
+
+    spans = {span["name"]: span for span in read_spans(trace_file)}
+    root = spans["count_numbers_submit"]
+    assert spans["GET /count-numbers"]["traceId"] == root["traceId"]
+    assert spans["GET /count-numbers"]["parentSpanId"] == spans["call_api"]["spanId"]
+    assert spans["display_results"]["parentSpanId"] == root["spanId"]
+    assert spans["call_api"]["kind"] == "client"
+
+def test_ui_job_path_is_traced(jobs, api_via_test_client, trace_file, monkeypatch):
+    import CountNumbers_UI as ui
+    monkeypatch.setattr(ui, "ASYNC_JOB_THRESHOLD", 10)
+    real_sleep = time.sleep
+    monkeypatch.setattr(ui.time, "sleep", lambda seconds: real_sleep(0.01))
+
+    with ui.TRACER.span("call_api", kind="client") as span, \
+            mock.patch("requests.post", side_effect=fake_post(jobs)):
+        result, error = ui.call_api("1, -2, 0, 3, 4, 5", "http://api", span=span)
+
+    assert error is None and result["counts"]["total"] == 6
+    assert span.attributes["job.status"] == "succeeded"
+    assert {"queue_wait", "parse_numbers", "count_numbers", "total"} <= set(span.attributes["server_timing"])
+    spans = read_spans(trace_file)
+    job_span = next(record for record in spans if record["name"] == "count_job")
+    submit_span = next(record for record in spans if record["name"] == "POST /jobs")
+    assert job_span["traceId"] == span.trace_id
+    assert job_span["parentSpanId"] == submit_span["spanId"]
+    assert all(record["traceId"] == span.trace_id for record in spans if record["name"].startswith("GET /jobs"))
+
+def test_ui_rejects_invalid_input_without_calling_api(api_via_test_client):
+    at = submit(AppTest.from_file(UI_SCRIPT).run(), "a, b, c")
+
+    assert any("Invalid number format" in markdown.value for markdown in at.markdown)
+    assert api_via_test_client.call_count == 0
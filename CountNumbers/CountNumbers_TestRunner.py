@@ -0,0 +1,131 @@
+import argparse
+import asyncio
+import logging
+import time
+from playwright.async_api import async_playwright
+
+from CountNumbers_Test import StreamlitTester, TEST_CASES, BROWSER_ARGS, VIEWPORT, run_scenario
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class BrowserPool:
+    """
+    Keep one Chromium per worker alive for a whole run and hand out
+    isolated contexts, so scenarios never pay for a browser launch and
+    never share cookies, storage or page state.
+    """
+
+    def __init__(self, workers: int = 2, headless: bool = True):
+        self.workers = max(1, workers)
+        self.headless = headless
+        self.playwright = None
+        self.browsers = []
+
+    async def start(self):
+        """Start Playwright and launch one browser per worker"""
+        self.playwright = await async_playwright().start()
+        self.browsers = await asyncio.gather(*[
+            self.playwright.chromium.launch(headless=self.headless, args=BROWSER_ARGS)
+            for _ in range(self.workers)
+        ])
+        logger.info(f"Browser pool ready: {self.workers} browser(s). Headless: {self.headless}")
+        return self
+
+    async def new_context(self, worker: int, **kwargs):
+        """Create a fresh browser context on the browser owned by `worker`"""
+        browser = self.browsers[worker % len(self.browsers)]
+        return await browser.new_context(viewport=VIEWPORT, **kwargs)
+
+    async def close(self):
+        """Close every browser and stop Playwright"""
+        await asyncio.gather(*[browser.close() for browser in self.browsers], return_exceptions=True)
+        self.browsers = []
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+        logger.info("Browser pool closed")
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+async def run_scenarios(test_cases=None, streamlit_url: str = "http://localhost:8501",
+                        workers: int = 2, contexts_per_worker: int = 2,
+                        headless: bool = True, screenshot: str = "failures"):
+    """
+    Run scenarios concurrently on a shared browser pool.
+
+    Each scenario gets its own browser context. At most
+    workers * contexts_per_worker scenarios are in flight at once.
+
+    Args:
+        test_cases (list): Scenarios to run (default: TEST_CASES)
+        streamlit_url (str): URL of the running Streamlit app
+        workers (int): Number of browsers to keep open
+        contexts_per_worker (int): Concurrent contexts per browser
+        headless (bool): Run browsers headless
+        screenshot (str): "always", "failures" or "never"
+
+    Returns:
+        list: Result records in the same order as test_cases
+    """
+    test_cases = TEST_CASES if test_cases is None else test_cases
+    results = [None] * len(test_cases)
+    queue = asyncio.Queue()
+    for index, test_case in enumerate(test_cases):
+        queue.put_nowait((index, test_case))
+
+    async def slot(pool: BrowserPool, worker: int):
+        while True:
+            try:
+                index, test_case = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            context = await pool.new_context(worker)
+            try:
+                page = await context.new_page()
+                tester = StreamlitTester(streamlit_url, page=page)
+                results[index] = await run_scenario(tester, test_case, index, screenshot=screenshot)
+            finally:
+                await context.close()
+
+    start_time = time.perf_counter()
+    async with BrowserPool(workers=workers, headless=headless) as pool:
+        slots = max(1, contexts_per_worker) * pool.workers
+        await asyncio.gather(*[slot(pool, i % pool.workers) for i in range(slots)])
+
+    elapsed = time.perf_counter() - start_time
+    passed = sum(1 for result in results if result["passed"])
+    logger.info(f"Ran {len(results)} scenario(s) in {elapsed:.2f}s: {passed}/{len(results)} passed")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Streamlit scenario matrix in parallel")
+    parser.add_argument("--url", default="http://localhost:8501", help="Streamlit app URL")
+    parser.add_argument("--workers", type=int, default=2, help="Browsers to keep open")
+    parser.add_argument("--contexts-per-worker", type=int, default=2, help="Concurrent contexts per browser")
+    parser.add_argument("--headed", action="store_true", help="Show the browsers")
+    parser.add_argument("--screenshots", choices=["always", "failures", "never"], default="failures")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_scenarios(
+        streamlit_url=args.url,
+        workers=args.workers,
+        contexts_per_worker=args.contexts_per_worker,
+        headless=not args.headed,
+        screenshot=args.screenshots
+    ))
+
+    for result in results:
+        status = "✅ PASSED" if result["passed"] else "❌ FAILED"
+        logger.info(f"   {status}: {result['test_case']}")
+        if result.get("error"):
+            logger.info(f"     Error: {result['error']}")
+
+    raise SystemExit(0 if all(result["passed"] for result in results) else 1)
+
+if __name__ == "__main__":
+    main()
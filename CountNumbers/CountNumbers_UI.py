@@ -1,8 +1,27 @@
 import streamlit as st
 import requests
+import gzip
 import json
+import os
+import time
 from datetime import datetime
 
+from tracing import Tracer, parse_server_timing
+
+# Start of this script run; Streamlit re-executes the whole script on every interaction
+RERUN_STARTED_NS = time.time_ns()
+
+# Spans go to TRACE_EXPORT_PATH (JSON lines) when it is set
+TRACER = Tracer('countnumbers-ui', os.environ.get('TRACE_EXPORT_PATH'))
+
+# Inputs longer than this are sent as a gzip-compressed POST body instead of a query string
+COMPRESS_BODY_THRESHOLD = 2048
+
+# Inputs longer than this are queued as a background job and polled, so no
+# single request has to stay open while the server counts
+ASYNC_JOB_THRESHOLD = 1_000_000
+JOB_WAIT_TIMEOUT = 600
+
 # Configure the page
 st.set_page_config(
     page_title="Number Counter API Client",
@@ -77,14 +96,76 @@ def validate_numbers(numbers_str):
     except ValueError:
         return None, "Invalid number format. Please use only numbers separated by commas."
 
-def call_api(numbers_str, api_url):
-    """Call the Flask API and return the response"""
+def wait_for_job(api_url, job, timeout=JOB_WAIT_TIMEOUT, span=None):
+    """
+    Poll /jobs/<id> until the job finishes; returns (result, error).
+    
+    Polls carry the span's traceparent, and the job's own stage timings are
+    stored on the span like a Server-Timing breakdown.
+    """
+    trace_headers = {'traceparent': span.traceparent} if span is not None else {}
+    deadline = time.monotonic() + timeout
+    delay = 0.2
+    polls = 0
+    while job['status'] in ('queued', 'running'):
+        if time.monotonic() > deadline:
+            return None, f"Timeout Error: job {job['job_id']} did not finish within {timeout} seconds."
+        time.sleep(delay)
+        delay = min(delay * 2, 2.0)
+        response = requests.get(f"{api_url}{job['location']}", headers=trace_headers, timeout=10)
+        polls += 1
+        if response.status_code != 200:
+            return None, f"API Error ({response.status_code}): {response.json().get('message', 'Unknown error')}"
+        job = dict(response.json(), location=job['location'])
+    
+    if span is not None:
+        span.set_attribute('job.id', job['job_id'])
+        span.set_attribute('job.status', job['status'])
+        span.set_attribute('job.polls', polls)
+        span.set_attribute('server_timing', (job.get('result') or {}).get('timing_ms', {}))
+    
+    if job['status'] == 'failed':
+        return None, f"Job Error: {job.get('error', 'Unknown error')}"
+    return job['result'], None
+
+def call_api(numbers_str, api_url, span=None):
+    """
+    Call the Flask API and return the response.
+    
+    If a tracing span is given, its trace context is sent in a traceparent
+    header and the server's Server-Timing breakdown is stored on the span.
+    """
+    trace_headers = {'traceparent': span.traceparent} if span is not None else {}
     try:
-        response = requests.get(
-            f"{api_url}/count-numbers",
-            params={'numbers': numbers_str},
-            timeout=10
-        )
+        if len(numbers_str) > ASYNC_JOB_THRESHOLD:
+            response = requests.post(
+                f"{api_url}/jobs",
+                data=gzip.compress(numbers_str.encode('utf-8'), compresslevel=6),
+                headers={'Content-Type': 'text/plain; charset=utf-8', 'Content-Encoding': 'gzip', **trace_headers},
+                timeout=10
+            )
+            if span is not None:
+                span.set_attribute('http.status_code', response.status_code)
+            if response.status_code == 202:
+                return wait_for_job(api_url, response.json(), span=span)
+        elif len(numbers_str) > COMPRESS_BODY_THRESHOLD:
+            response = requests.post(
+                f"{api_url}/count-numbers",
+                data=gzip.compress(numbers_str.encode('utf-8'), compresslevel=6),
+                headers={'Content-Type': 'text/plain; charset=utf-8', 'Content-Encoding': 'gzip', **trace_headers},
+                timeout=10
+            )
+        else:
+            response = requests.get(
+                f"{api_url}/count-numbers",
+                params={'numbers': numbers_str},
+                headers=trace_headers,
+                timeout=10
+            )
+        
+        if span is not None:
+            span.set_attribute('http.status_code', response.status_code)
+            span.set_attribute('server_timing', parse_server_timing(response.headers.get('Server-Timing')))
         
         if response.status_code == 200:
             return response.json(), None
@@ -106,6 +187,35 @@ def show_popup_message(message, message_type="info"):
     css_class = f"popup-{message_type}"
     st.markdown(f'<div class="{css_class}">{message}</div>', unsafe_allow_html=True)
 
+def timing_breakdown(root, stages):
+    """
+    Turn the spans of one submission into rows for the timing panel.
+    
+    Server stages come from the Server-Timing header stored on the call_api
+    span; whatever call_api took beyond the server's total is network and
+    client overhead.
+    """
+    rows = []
+    for span in stages:
+        rows.append({'Stage': span.name, 'Milliseconds': round(span.duration_ms, 2)})
+        server_timing = span.attributes.get('server_timing')
+        if server_timing:
+            server_total = server_timing.get('total', 0.0)
+            for name, duration in server_timing.items():
+                if name != 'total':
+                    rows.append({'Stage': f"  server: {name}", 'Milliseconds': round(duration, 2)})
+            rows.append({'Stage': '  server: total', 'Milliseconds': round(server_total, 2)})
+            rows.append({'Stage': '  network + client overhead',
+                         'Milliseconds': round(max(0.0, span.duration_ms - server_total), 2)})
+    rows.append({'Stage': 'total', 'Milliseconds': round(root.duration_ms, 2)})
+    return {'trace_id': root.trace_id, 'rows': rows}
+
+def display_timings(timings):
+    """Show the timing breakdown of the last request"""
+    st.markdown("## ⏱️ Timing Breakdown (last request)")
+    st.table(timings['rows'])
+    st.caption(f"Trace ID: {timings['trace_id']}")
+
 def display_results(data):
     """Display the API results in a formatted way"""
     if not data:
@@ -186,6 +296,11 @@ def main():
             except:
                 st.error("❌ Cannot connect to API")
         
+        show_timings = st.checkbox(
+            "⏱️ Show timing breakdown",
+            help="Time each stage of the last request, on this client and on the API server"
+        )
+        
         st.markdown("---")
         st.markdown("### 📖 Instructions")
         st.markdown("""
@@ -221,8 +336,14 @@ def main():
     
     # Handle form submission
     if submit_button and numbers_input:
+        # Trace this submission from the start of the rerun that handles it
+        root = TRACER.start_span('count_numbers_submit', kind='client', start_ns=RERUN_STARTED_NS)
+        stages = [TRACER.start_span('streamlit_rerun', parent=root, start_ns=RERUN_STARTED_NS).end()]
+        
         # Validate input
-        numbers_list, validation_error = validate_numbers(numbers_input)
+        with TRACER.span('validate_numbers', parent=root) as span:
+            numbers_list, validation_error = validate_numbers(numbers_input)
+        stages.append(span)
         
         if validation_error:
             show_popup_message(f"❌ {validation_error}", "error")
@@ -230,7 +351,9 @@ def main():
             # Show processing message
             with st.spinner("Processing your request..."):
                 # Call API
-                api_response, api_error = call_api(numbers_input, api_url)
+                with TRACER.span('call_api', parent=root, kind='client') as span:
+                    api_response, api_error = call_api(numbers_input, api_url, span=span)
+                stages.append(span)
                 
                 if api_error:
                     show_popup_message(f"❌ {api_error}", "error")
@@ -239,11 +362,16 @@ def main():
                     show_popup_message("✅ Numbers counted successfully!", "success")
                     
                     # Display results
-                    display_results(api_response)
+                    with TRACER.span('display_results', parent=root) as span:
+                        display_results(api_response)
+                    stages.append(span)
                     
                     # Show raw JSON response in expandable section
                     with st.expander("🔍 Raw API Response"):
                         st.json(api_response)
+        
+        root.end()
+        st.session_state['last_timings'] = timing_breakdown(root, stages)
     
     elif submit_button:
         show_popup_message("❌ Please enter some numbers first!", "error")
@@ -251,6 +379,9 @@ def main():
     elif clear_button:
         st.rerun()
     
+    if show_timings and 'last_timings' in st.session_state:
+        display_timings(st.session_state['last_timings'])
+    
     # Footer
     st.markdown("---")
     st.markdown("### 🔗 API Endpoints")
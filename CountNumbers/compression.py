@@ -0,0 +1,157 @@
+import zlib
+
+# Optional codecs: used when the packages are installed, skipped otherwise
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CHUNK_SIZE = 64 * 1024
+
+class PayloadTooLarge(Exception):
+    """Decoded request body is larger than the configured limit"""
+
+class UnsupportedEncoding(Exception):
+    """Content-Encoding that this server cannot decode"""
+
+class InvalidPayload(Exception):
+    """Compressed request body is corrupt or truncated"""
+
+def supported_encodings():
+    """
+    List the content codings this server can decode and produce.
+
+    Returns:
+        list: Codings in server preference order
+    """
+    encodings = []
+    if zstandard is not None:
+        encodings.append('zstd')
+    if brotli is not None:
+        encodings.append('br')
+    encodings.extend(['gzip', 'deflate'])
+    return encodings
+
+def _read_limited(stream, max_size):
+    data = stream.read(max_size + 1)
+    if len(data) > max_size:
+        raise PayloadTooLarge(f"Request body exceeds {max_size} bytes")
+    return data
+
+def _decode_zlib(stream, wbits, max_size):
+    """Inflate chunk by chunk, never producing more than max_size + 1 bytes"""
+    decompressor = zlib.decompressobj(wbits)
+    output = bytearray()
+    try:
+        while not decompressor.eof:
+            chunk = decompressor.unconsumed_tail or stream.read(CHUNK_SIZE)
+            if not chunk:
+                raise InvalidPayload("Compressed body is truncated")
+            output += decompressor.decompress(chunk, max_size + 1 - len(output))
+            if len(output) > max_size:
+                raise PayloadTooLarge(f"Decompressed body exceeds {max_size} bytes")
+    except zlib.error as e:
+        raise InvalidPayload(f"Corrupt compressed body: {e}") from None
+    return bytes(output)
+
+def _decode_brotli(stream, max_size):
+    decompressor = brotli.Decompressor()
+    output = bytearray()
+    try:
+        # Small input chunks bound how far one call can expand before the size check
+        while chunk := stream.read(CHUNK_SIZE // 16):
+            output += decompressor.process(chunk)
+            if len(output) > max_size:
+                raise PayloadTooLarge(f"Decompressed body exceeds {max_size} bytes")
+    except brotli.error as e:
+        raise InvalidPayload(f"Corrupt compressed body: {e}") from None
+    return bytes(output)
+
+def _decode_zstd(stream, max_size):
+    try:
+        with zstandard.ZstdDecompressor().stream_reader(stream) as reader:
+            return _read_limited(reader, max_size)
+    except zstandard.ZstdError as e:
+        raise InvalidPayload(f"Corrupt compressed body: {e}") from None
+
+def decode_body(stream, content_encoding, max_size):
+    """
+    Read and decode a request body without ever holding more than max_size decoded bytes.
+
+    Args:
+        stream: File-like request body
+        content_encoding (str): Content-Encoding header value (may be None)
+        max_size (int): Largest allowed decoded size in bytes
+
+    Returns:
+        bytes: The decoded body
+
+    Raises:
+        PayloadTooLarge: If the decoded body would exceed max_size
+        UnsupportedEncoding: If the coding is unknown or its codec is not installed
+        InvalidPayload: If the compressed data is corrupt
+    """
+    encoding = (content_encoding or 'identity').strip().lower()
+
+    if encoding == 'identity':
+        return _read_limited(stream, max_size)
+    if encoding in ('gzip', 'x-gzip'):
+        return _decode_zlib(stream, 16 + zlib.MAX_WBITS, max_size)
+    if encoding == 'deflate':
+        return _decode_zlib(stream, zlib.MAX_WBITS, max_size)
+    if encoding == 'br' and brotli is not None:
+        return _decode_brotli(stream, max_size)
+    if encoding == 'zstd' and zstandard is not None:
+        return _decode_zstd(stream, max_size)
+    raise UnsupportedEncoding(f"Unsupported Content-Encoding '{encoding}'. Supported: {', '.join(supported_encodings())}")
+
+def negotiate(accept_encoding):
+    """
+    Pick a response coding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding (str): Header value, e.g. "gzip, br;q=0.9"
+
+    Returns:
+        str: The chosen coding, or None to send the body uncompressed
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[coding.strip().lower()] = quality
+
+    candidates = [
+        (weights.get(coding, weights.get('*', 0.0)), -rank, coding)
+        for rank, coding in enumerate(supported_encodings())
+    ]
+    quality, _, coding = max(candidates)
+    return coding if quality > 0 else None
+
+def compress(data, encoding, level=6):
+    """Compress a response body with a coding returned by negotiate()"""
+    if encoding == 'gzip':
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+    if encoding == 'deflate':
+        return zlib.compress(data, level)
+    if encoding == 'br':
+        return brotli.compress(data, quality=min(level, 11))
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    raise UnsupportedEncoding(f"Unsupported encoding '{encoding}'")
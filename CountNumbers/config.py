@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 class Config:
     """Configuration class for Flask application"""
@@ -7,6 +8,37 @@ class Config:
     PORT = int(os.environ.get('PORT', 5000))
     DEBUG = os.environ.get('DEBUG', 'False').lower() == 'true'
     
+    # Request bodies: limit on the bytes received and on the bytes after decompression
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))
+    MAX_DECOMPRESSED_SIZE = int(os.environ.get('MAX_DECOMPRESSED_SIZE', 64 * 1024 * 1024))
+    
+    # Responses smaller than this are sent uncompressed
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', 6))
+    
+    # Background jobs: SQLite file, worker threads, seconds finished results are kept
+    JOBS_DB_PATH = os.environ.get('JOBS_DB_PATH', os.path.join(tempfile.gettempdir(), 'countnumbers-jobs.sqlite3'))
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+    JOB_RESULT_TTL = int(os.environ.get('JOB_RESULT_TTL', 3600))
+    
+    # Per-client rate limiting (token buckets shared by all worker processes).
+    # A request costs 1 token plus 1 per RATE_LIMIT_BYTES_PER_TOKEN bytes of payload.
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'True').lower() == 'true'
+    RATE_LIMIT_PATH = os.environ.get('RATE_LIMIT_PATH')
+    RATE_LIMIT_RATE = float(os.environ.get('RATE_LIMIT_RATE', 50))
+    RATE_LIMIT_BURST = float(os.environ.get('RATE_LIMIT_BURST', 200))
+    RATE_LIMIT_BYTES_PER_TOKEN = int(os.environ.get('RATE_LIMIT_BYTES_PER_TOKEN', 16 * 1024))
+    RATE_LIMIT_SLOTS = int(os.environ.get('RATE_LIMIT_SLOTS', 4096))
+    # Only these X-API-Key values get their own bucket; any other request is keyed by IP.
+    # Exempt keys (e.g. a scatter-gather coordinator's) are not limited at all.
+    RATE_LIMIT_API_KEYS = frozenset(filter(None, os.environ.get('RATE_LIMIT_API_KEYS', '').split(',')))
+    RATE_LIMIT_EXEMPT_KEYS = frozenset(filter(None, os.environ.get('RATE_LIMIT_EXEMPT_KEYS', '').split(',')))
+    
+    # Request tracing: spans for each stage, summarized in a Server-Timing header
+    # and appended as JSON lines to TRACE_EXPORT_PATH when it is set
+    TRACING_ENABLED = os.environ.get('TRACING_ENABLED', 'True').lower() == 'true'
+    TRACE_EXPORT_PATH = os.environ.get('TRACE_EXPORT_PATH')
+    
     # You can add more configuration options here
     # For example:
     # SECRET_KEY = os.environ.get('SECRET_KEY', 'your-secret-key-here')
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_fingerprint ON jobs (fingerprint);
+CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at);
+"""
+
+def fingerprint(*parts):
+    """Hash the parts of a submission that determine its result"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8') if isinstance(part, str) else part)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+class JobStore:
+    """
+    Job status and results in a SQLite file, shared by every thread and
+    process that opens the same path.
+
+    Finished jobs expire `ttl` seconds after they finish. Queued or running
+    jobs not updated for `stale_after` seconds (e.g. their process died) are
+    marked failed so that a resubmission starts a new job.
+    """
+
+    def __init__(self, path, ttl=3600, stale_after=3600):
+        self.path = path
+        self.ttl = ttl
+        self.stale_after = stale_after
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self):
+        """One connection per thread; WAL lets readers run during writes"""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            db.execute('PRAGMA journal_mode=WAL')
+            self._local.db = db
+        return db
+
+    def submit(self, job_fingerprint):
+        """
+        Create a queued job, or return the live job with the same fingerprint.
+
+        Returns:
+            tuple: (job dict, True if a new job was created)
+        """
+        db = self._connect()
+        now = time.time()
+        # IMMEDIATE takes the write lock first, so two processes cannot both miss the duplicate
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            db.execute('DELETE FROM jobs WHERE expires_at <= ?', (now,))
+            db.execute(
+                'UPDATE jobs SET status = ?, error = ?, updated_at = ?, expires_at = ? '
+                'WHERE status IN (?, ?) AND updated_at <= ?',
+                (FAILED, 'Job was interrupted', now, now + self.ttl, QUEUED, RUNNING, now - self.stale_after)
+            )
+            row = db.execute(
+                'SELECT * FROM jobs WHERE fingerprint = ? AND status != ? ORDER BY created_at DESC LIMIT 1',
+                (job_fingerprint, FAILED)
+            ).fetchone()
+            if row is not None:
+                db.execute('COMMIT')
+                return self._to_dict(row), False
+
+            job_id = uuid.uuid4().hex
+            db.execute(
+                'INSERT INTO jobs (id, fingerprint, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+                (job_id, job_fingerprint, QUEUED, now, now)
+            )
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        return self.get(job_id), True
+
+    def mark_running(self, job_id):
+        self._connect().execute(
+            'UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?',
+            (RUNNING, time.time(), job_id)
+        )
+
+    def finish(self, job_id, result=None, error=None):
+        """Store a job's result (or error) and start its TTL"""
+        now = time.time()
+        self._connect().execute(
+            'UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ?, expires_at = ? WHERE id = ?',
+            (FAILED if error is not None else SUCCEEDED,
+             None if result is None else json.dumps(result),
+             error, now, now + self.ttl, job_id)
+        )
+
+    def get(self, job_id):
+        """
+        Look up a job.
+
+        Returns:
+            dict: The job, or None if it does not exist or has expired
+        """
+        row = self._connect().execute(
+            'SELECT * FROM jobs WHERE id = ? AND (expires_at IS NULL OR expires_at > ?)',
+            (job_id, time.time())
+        ).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    @staticmethod
+    def _to_dict(row):
+        job = {
+            'job_id': row['id'],
+            'status': row['status'],
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at'],
+            'expires_at': row['expires_at']
+        }
+        if row['status'] == SUCCEEDED:
+            job['result'] = json.loads(row['result'])
+        elif row['status'] == FAILED:
+            job['error'] = row['error']
+        return job
+
+class JobQueue:
+    """
+    Run submitted work on a background thread pool and record the outcome
+    in a JobStore.
+
+    Args:
+        store (JobStore): Where status and results are kept
+        workers (int): Jobs processed at the same time
+    """
+
+    def __init__(self, store, workers=2):
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+
+    def submit(self, job_fingerprint, func, *args):
+        """
+        Queue func(*args) unless an identical job is already queued, running
+        or finished and unexpired.
+
+        Returns:
+            tuple: (job dict, True if the work was queued by this call)
+        """
+        job, created = self.store.submit(job_fingerprint)
+        if created:
+            self._executor.submit(self._run, job['job_id'], func, args)
+        return job, created
+
+    def _run(self, job_id, func, args):
+        self.store.mark_running(job_id)
+        try:
+            result = func(*args)
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed")
+            self.store.finish(job_id, error=str(e))
+        else:
+            self.store.finish(job_id, result=result)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
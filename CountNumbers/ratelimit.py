@@ -0,0 +1,144 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+# Record locks keep processes apart; without fcntl (Windows) only threads are
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# File layout: header, then slots of (key hash, tokens, last refill time).
+# Key hash 0 marks an empty slot.
+HEADER = struct.Struct('<8sQ')
+MAGIC = b'TBKT0001'
+SLOT = struct.Struct('<Qdd')
+PROBES = 8
+
+def default_path():
+    """A file in /dev/shm when it exists, so the table lives in RAM"""
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(directory, 'countnumbers-ratelimit')
+
+def key_hash(key):
+    """64-bit non-zero hash of a client key"""
+    value = int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+    return value or 1
+
+class TokenBucketLimiter:
+    """
+    Token buckets in a memory-mapped file, so every worker process that
+    opens the same path enforces the same limits.
+
+    Each client key gets a bucket holding up to `burst` tokens and
+    refilling at `rate` tokens per second. The table has a fixed number of
+    slots; when a key's probe window is full, the least recently used
+    bucket in it is reused.
+
+    Args:
+        path (str): Shared file (created if missing)
+        rate (float): Tokens added per second
+        burst (float): Bucket capacity
+        slots (int): Buckets in the table
+    """
+
+    def __init__(self, path=None, rate=50.0, burst=200.0, slots=4096):
+        self.path = path or default_path()
+        self.rate = rate
+        self.burst = burst
+        self._thread_lock = threading.Lock()
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                size = HEADER.size + (slots + PROBES) * SLOT.size
+                if os.fstat(fd).st_size < HEADER.size:
+                    os.ftruncate(fd, size)
+                    os.pwrite(fd, HEADER.pack(MAGIC, slots), 0)
+                magic, self.slots = HEADER.unpack(os.pread(fd, HEADER.size, 0))
+                if magic != MAGIC:
+                    raise ValueError(f"{self.path} is not a rate limit table")
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+            self._map = mmap.mmap(fd, HEADER.size + (self.slots + PROBES) * SLOT.size)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def _window(self, hashed):
+        """Byte offset and length of the slots a key may occupy"""
+        start = HEADER.size + (hashed % self.slots) * SLOT.size
+        return start, PROBES * SLOT.size
+
+    def _update(self, key, cost, must_fit):
+        """
+        Refill the key's bucket and take `cost` tokens from it.
+
+        If must_fit is set, tokens are only taken when the bucket holds at
+        least min(cost, burst); oversized requests therefore pass on a full
+        bucket and leave it in debt. Otherwise the cost is always taken.
+
+        Returns:
+            tuple: (allowed, tokens left)
+        """
+        hashed = key_hash(key)
+        start, length = self._window(hashed)
+        now = time.time()
+
+        with self._thread_lock:
+            if fcntl is not None:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+            try:
+                target = None
+                oldest = None
+                for offset in range(start, start + length, SLOT.size):
+                    slot_hash, tokens, updated = SLOT.unpack_from(self._map, offset)
+                    if slot_hash == hashed:
+                        target = offset
+                        break
+                    if slot_hash == 0:
+                        target, tokens, updated = offset, self.burst, now
+                        break
+                    if oldest is None or updated < oldest[1]:
+                        oldest = (offset, updated)
+                else:
+                    # Window full: reuse the least recently used bucket
+                    target, tokens, updated = oldest[0], self.burst, now
+
+                tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+                allowed = not must_fit or tokens >= min(cost, self.burst)
+                if allowed:
+                    tokens -= cost
+                SLOT.pack_into(self._map, target, hashed, tokens, now)
+                return allowed, tokens
+            finally:
+                if fcntl is not None:
+                    fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+
+    def acquire(self, key, cost=1.0):
+        """
+        Take `cost` tokens from the key's bucket if it has enough.
+
+        Returns:
+            tuple: (allowed, seconds to wait before retrying; 0 if allowed)
+        """
+        allowed, tokens = self._update(key, cost, must_fit=True)
+        if allowed:
+            return True, 0.0
+        return False, (min(cost, self.burst) - tokens) / self.rate
+
+    def charge(self, key, cost):
+        """Take extra tokens for work discovered after acquire; the bucket may go negative"""
+        self._update(key, cost, must_fit=False)
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
@@ -0,0 +1,134 @@
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+# W3C Trace Context: version-traceid-parentid-flags
+TRACEPARENT_RE = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+def parse_traceparent(header):
+    """
+    Read a W3C traceparent header.
+
+    Returns:
+        tuple: (trace_id, parent_span_id), or None if the header is missing or invalid
+    """
+    match = TRACEPARENT_RE.match((header or '').strip().lower())
+    if match is None or set(match.group(1)) == {'0'} or set(match.group(2)) == {'0'}:
+        return None
+    return match.group(1), match.group(2)
+
+def format_server_timing(spans):
+    """Server-Timing header value for finished spans, durations in milliseconds"""
+    return ', '.join(f"{span.name};dur={span.duration_ms:.3f}" for span in spans)
+
+def parse_server_timing(header):
+    """
+    Read a Server-Timing header.
+
+    Returns:
+        dict: metric name -> duration in milliseconds
+    """
+    timings = {}
+    for metric in (header or '').split(','):
+        name, *params = [part.strip() for part in metric.split(';')]
+        for param in params:
+            key, _, value = param.partition('=')
+            if name and key == 'dur':
+                try:
+                    timings[name] = float(value)
+                except ValueError:
+                    pass
+    return timings
+
+class Span:
+    """One timed operation in a trace"""
+
+    def __init__(self, tracer, name, trace_id, parent_id=None, kind='internal', start_ns=None, attributes=None):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes or {})
+
+    @property
+    def traceparent(self):
+        """traceparent header value that makes a remote span a child of this one"""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @property
+    def duration_ms(self):
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def end(self):
+        """Stop the clock and hand the span to the tracer's exporter (once)"""
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.tracer.export(self)
+        return self
+
+    def to_dict(self):
+        """Span as an OTLP/JSON-style record"""
+        return {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': self.start_ns,
+            'endTimeUnixNano': self.end_ns,
+            'attributes': self.attributes,
+            'resource': {'service.name': self.tracer.service}
+        }
+
+class Tracer:
+    """
+    Create spans and append finished ones as JSON lines to a file.
+
+    Args:
+        service (str): Service name recorded on every span
+        export_path (str): JSON lines file; None keeps spans in memory only
+    """
+
+    def __init__(self, service, export_path=None):
+        self.service = service
+        self.export_path = export_path
+        self._lock = threading.Lock()
+
+    def start_span(self, name, parent=None, traceparent=None, kind='internal', start_ns=None, attributes=None):
+        """
+        Start a span under a local parent span, a remote traceparent, or as a new trace.
+        """
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            trace_id, parent_id = parse_traceparent(traceparent) or (os.urandom(16).hex(), None)
+        return Span(self, name, trace_id, parent_id, kind, start_ns, attributes)
+
+    @contextmanager
+    def span(self, name, parent=None, kind='internal', **attributes):
+        """Time a block as a span; an exception is recorded and re-raised"""
+        span = self.start_span(name, parent=parent, kind=kind, attributes=attributes)
+        try:
+            yield span
+        except Exception as e:
+            span.set_attribute('error', f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            span.end()
+
+    def export(self, span):
+        if self.export_path is None:
+            return
+        line = json.dumps(span.to_dict()) + '\n'
+        with self._lock, open(self.export_path, 'a', encoding='utf-8') as f:
+            f.write(line)
@@ -1,15 +1,142 @@
 # Program 1: Check if a number is even or odd and also check a list of numbers
 
-# Single number check
-num = int(input("Enter a number to check if it's even or odd: "))
-if num % 2 == 0:
-    print(f"{num} is Even.")
-else:
-    print(f"{num} is Odd.")
-
-# Check a list of numbers
-number_list = [3, 12, 7, 20, 9]
-print("\nChecking list of numbers:")
-for n in number_list:
-    result = "Even" if n % 2 == 0 else "Odd"
-    print(f"{n} is {result}")
+import argparse
+import json
+import struct
+import sys
+
+import numpy as np
+
+from batch_utils import iter_chunks
+
+# Bitmap file layout: 4-byte magic, 4 bytes padding, uint64 element count,
+# then one bit per element (1 = odd), least significant bit first
+BITMAP_HEADER = struct.Struct("<4s4xQ")
+BITMAP_MAGIC = b"PAR1"
+
+def describe_parity(n):
+    """Return "Even" or "Odd" for one integer"""
+    return "Even" if n % 2 == 0 else "Odd"
+
+def parity_bits(numbers):
+    """
+    Compute parity for an integer array with a bitwise AND.
+
+    Returns:
+        numpy.ndarray: uint8 array, 1 where the number is odd
+    """
+    numbers = np.asarray(numbers)
+    if not np.issubdtype(numbers.dtype, np.integer):
+        numbers = numbers.astype(np.int64)
+    # Two's complement keeps the low bit meaningful for negative numbers too
+    return np.bitwise_and(numbers, 1).astype(np.uint8)
+
+def parity_counts(numbers):
+    """
+    Count even and odd numbers without materializing any text.
+
+    Returns:
+        dict: even, odd and total counts
+    """
+    odd = int(np.count_nonzero(parity_bits(numbers)))
+    total = len(numbers)
+    return {"even": total - odd, "odd": odd, "total": total}
+
+def pack_parity(numbers):
+    """Pack parity into one bit per number (1 = odd, LSB first)"""
+    return np.packbits(parity_bits(numbers), bitorder="little")
+
+def iter_integer_chunks(path, chunk_size=1 << 20):
+    """
+    Stream integers from a file in arrays of chunk_size elements.
+
+    Text files hold one integer per line; .npy files are memory-mapped.
+    chunk_size should be a multiple of 8 so chunks pack without carry bits.
+    """
+    if str(path).endswith(".npy"):
+        data = np.load(path, mmap_mode="r")
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+        return
+
+    with open(path) as f:
+        for lines in iter_chunks((line for line in f if line.strip()), chunk_size):
+            yield np.array([line.strip() for line in lines]).astype(np.int64)
+
+def write_parity_bitmap(chunks, path):
+    """
+    Write a packed parity bitmap for a stream of integer arrays.
+
+    Args:
+        chunks: Iterable of integer arrays; every chunk but the last must
+            have a length divisible by 8
+        path (str): Output file
+
+    Returns:
+        dict: even, odd and total counts
+    """
+    total = odd = 0
+    with open(path, "wb") as f:
+        f.write(BITMAP_HEADER.pack(BITMAP_MAGIC, 0))
+        for chunk in chunks:
+            if total % 8:
+                raise ValueError("Only the last chunk may have a length that is not a multiple of 8")
+            bits = parity_bits(chunk)
+            f.write(np.packbits(bits, bitorder="little").tobytes())
+            odd += int(np.count_nonzero(bits))
+            total += len(bits)
+        # Fill in the element count now that it is known
+        f.seek(0)
+        f.write(BITMAP_HEADER.pack(BITMAP_MAGIC, total))
+    return {"even": total - odd, "odd": odd, "total": total}
+
+def load_parity_bitmap(path):
+    """
+    Memory-map a bitmap written by write_parity_bitmap.
+
+    Returns:
+        tuple: (packed uint8 memmap, element count)
+    """
+    with open(path, "rb") as f:
+        magic, count = BITMAP_HEADER.unpack(f.read(BITMAP_HEADER.size))
+    if magic != BITMAP_MAGIC:
+        raise ValueError(f"{path} is not a parity bitmap")
+    packed = np.memmap(path, dtype=np.uint8, mode="r", offset=BITMAP_HEADER.size, shape=((count + 7) // 8,))
+    return packed, count
+
+def is_odd_at(packed, index):
+    """Look up the parity of element `index` in a packed bitmap"""
+    return bool(packed[index >> 3] >> (index & 7) & 1)
+
+def run_bulk(argv=None):
+    """Command-line entry point for bulk parity of a file of integers"""
+    parser = argparse.ArgumentParser(description="Compute parity for a file of integers")
+    parser.add_argument("--file", required=True, help="Integers, one per line (or a .npy array)")
+    parser.add_argument("--bitmap", help="Write a packed parity bitmap (1 bit per number) to this file")
+    args = parser.parse_args(argv)
+
+    if args.bitmap:
+        counts = write_parity_bitmap(iter_integer_chunks(args.file), args.bitmap)
+    else:
+        counts = {"even": 0, "odd": 0, "total": 0}
+        for chunk in iter_integer_chunks(args.file):
+            for key, value in parity_counts(chunk).items():
+                counts[key] += value
+    print(json.dumps(counts))
+
+def main():
+    # Single number check
+    num = int(input("Enter a number to check if it's even or odd: "))
+    print(f"{num} is {describe_parity(num)}.")
+
+    # Check a list of numbers
+    number_list = [3, 12, 7, 20, 9]
+    print("\nChecking list of numbers:")
+    for n in number_list:
+        print(f"{n} is {describe_parity(n)}")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_bulk()
+    else:
+        main()
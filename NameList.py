@@ -2,9 +2,14 @@
 # Name List : Store 5 names in a list and print them with their lengths.
 # Use filename as NameList.py
 
+import io
+
 import streamlit as st
 import pandas as pd
 
+# Rows of the longest-names chart
+DEFAULT_TOP_N = 10
+
 # Title
 st.title("Name Length Analyzer")
 
@@ -12,6 +17,39 @@ st.title("Name Length Analyzer")
 if "names" not in st.session_state:
     st.session_state.names = [""] * 5
 
+# --- Bulk name list helpers ---
+@st.cache_resource(max_entries=2, show_spinner="Reading name list...")
+def load_names(file_id, _data, filename):
+    """
+    Parse an uploaded name list once per upload.
+    
+    Cached as a resource (shared, not copied) and keyed by the upload's
+    file_id, so reruns never re-read or re-hash millions of rows.
+    """
+    if filename.lower().endswith(".csv"):
+        frame = pd.read_csv(io.BytesIO(_data), dtype=str, keep_default_na=False)
+        # Prefer a column called "name", otherwise take the first one
+        column = next((c for c in frame.columns if c.strip().lower() == "name"), frame.columns[0])
+        names = frame[column]
+    else:
+        names = pd.Series(_data.decode("utf-8", errors="replace").splitlines(), dtype=str)
+    names = names.str.strip()
+    return names[names != ""].reset_index(drop=True)
+
+@st.cache_data(max_entries=8)
+def summarize_name_lengths(file_id, _names, top_n):
+    """Aggregate name lengths into a distribution and the top-N longest names"""
+    lengths = _names.str.len()
+    distribution = lengths.value_counts().sort_index().rename_axis("Length").rename("Names")
+    longest = lengths.nlargest(top_n)
+    top = pd.DataFrame({"Name": _names[longest.index].values, "Length": longest.values})
+    stats = {
+        "count": int(lengths.size),
+        "mean": float(lengths.mean()) if lengths.size else 0.0,
+        "max": int(lengths.max()) if lengths.size else 0
+    }
+    return distribution, top, stats
+
 # --- Reset function ---
 def reset_app():
     st.session_state.names = [""] * 5
@@ -42,3 +80,28 @@ if st.button("Measure Length"):
 # --- Reset button ---
 if st.button("Reset"):
     reset_app()
+
+# --- Bulk name list ---
+st.subheader("Analyze a Name List File")
+uploaded = st.file_uploader("Upload names (CSV with a 'name' column, or TXT with one name per line)",
+                            type=["csv", "txt"])
+
+if uploaded is not None:
+    names = load_names(uploaded.file_id, uploaded.getvalue(), uploaded.name)
+    
+    if names.empty:
+        st.warning("The uploaded file has no names.")
+    else:
+        top_n = st.slider("Longest names to show", min_value=5, max_value=50, value=DEFAULT_TOP_N)
+        distribution, top, stats = summarize_name_lengths(uploaded.file_id, names, top_n)
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Names", f"{stats['count']:,}")
+        col2.metric("Average Length", f"{stats['mean']:.1f}")
+        col3.metric("Longest", stats["max"])
+        
+        st.subheader("Length Distribution")
+        st.bar_chart(distribution)
+        
+        st.subheader(f"Top {len(top)} Longest Names")
+        st.bar_chart(top.set_index("Name"))
@@ -1,3 +1,17 @@
+import argparse
+import sys
+
+import numpy as np
+
+# Message templates keyed by the sign of num1 - num2
+COMPARISON_TEMPLATES = {
+    1: "{} is greater than {}",
+    -1: "{} is less than {}",
+    0: "{} is equal to {}"
+}
+
+# Message for pairs where either value is NaN
+UNORDERED_TEMPLATE = "{} cannot be compared with {}"
 
 def compare_numbers(num1, num2):
     """
@@ -11,11 +25,175 @@ def compare_numbers(num1, num2):
         str: Comparison result
     """
     if num1 > num2:
-        return f"{num1} is greater than {num2}"
+        return COMPARISON_TEMPLATES[1].format(num1, num2)
+    elif num1 < num2:
+        return COMPARISON_TEMPLATES[-1].format(num1, num2)
+    else:
+        return COMPARISON_TEMPLATES[0].format(num1, num2)
+
+def describe_difference(num1, num2):
+    """
+    Describe which number is larger and by how much
+    
+    Args:
+        num1: First number
+        num2: Second number
+    
+    Returns:
+        str: Difference description
+    """
+    if num1 > num2:
+        return f"{num1} is larger by {num1 - num2}"
     elif num1 < num2:
-        return f"{num1} is less than {num2}"
+        return f"{num2} is larger by {num2 - num1}"
     else:
-        return f"{num1} is equal to {num2}"
+        return "Both numbers are identical"
+
+class BatchComparison:
+    """
+    Structured result of compare_batch
+    
+    Attributes:
+        first, second: The compared float64 columns
+        sign: int8 array, 1 where first > second, -1 where first < second,
+            0 where equal within tolerance or either value is NaN
+        abs_diff: float64 array of |first - second|
+        equal: bool array, True where |first - second| <= tolerance
+    """
+    
+    def __init__(self, first, second, sign, abs_diff, equal, tolerance):
+        self.first = first
+        self.second = second
+        self.sign = sign
+        self.abs_diff = abs_diff
+        self.equal = equal
+        self.tolerance = tolerance
+    
+    def __len__(self):
+        return len(self.sign)
+    
+    def summary(self):
+        """
+        Count the outcomes
+        
+        Returns:
+            dict: total, greater, less, equal and unordered (NaN) counts
+        """
+        total = len(self.sign)
+        greater = int(np.count_nonzero(self.sign == 1))
+        less = int(np.count_nonzero(self.sign == -1))
+        equal = int(np.count_nonzero(self.equal))
+        return {
+            "total": total,
+            "greater": greater,
+            "less": less,
+            "equal": equal,
+            "unordered": total - greater - less - equal
+        }
+    
+    def messages(self, start=0, stop=None):
+        """
+        Format comparison sentences for a slice of rows, only when asked
+        
+        Args:
+            start: First row (default: 0)
+            stop: Row to stop before (default: end)
+        
+        Yields:
+            str: The compare_numbers sentence for each row
+        """
+        rows = slice(start, stop)
+        columns = (self.first[rows].tolist(), self.second[rows].tolist(),
+                   self.sign[rows].tolist(), self.equal[rows].tolist())
+        for num1, num2, sign, equal in zip(*columns):
+            template = COMPARISON_TEMPLATES[sign] if sign or equal else UNORDERED_TEMPLATE
+            yield template.format(num1, num2)
+
+def compare_batch(first, second, tolerance=0.0):
+    """
+    Compare two aligned numeric columns in one vectorized pass
+    
+    Args:
+        first: Array-like of numbers
+        second: Array-like of numbers, same length as first
+        tolerance: Largest absolute difference still counted as equal
+    
+    Returns:
+        BatchComparison: Per-row sign, absolute difference and equality
+    """
+    first = np.asarray(first, dtype=np.float64)
+    second = np.asarray(second, dtype=np.float64)
+    if first.shape != second.shape:
+        raise ValueError(f"Columns are not aligned: {first.shape} vs {second.shape}")
+    
+    diff = first - second
+    abs_diff = np.abs(diff)
+    equal = abs_diff <= tolerance
+    sign = np.zeros(diff.shape, dtype=np.int8)
+    sign[diff > tolerance] = 1
+    sign[diff < -tolerance] = -1
+    return BatchComparison(first, second, sign, abs_diff, equal, tolerance)
+
+def load_column(path, column=0, delimiter=",", skip_header=0):
+    """
+    Load one numeric column from a delimited text file or a .npy file
+    
+    Args:
+        path: File path; .npy files are memory-mapped, not read
+        column: Zero-based column index for text files
+        delimiter: Field delimiter for text files
+        skip_header: Header lines to skip in text files
+    
+    Returns:
+        numpy.ndarray: The column
+    """
+    if str(path).endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    return np.loadtxt(path, delimiter=delimiter, usecols=column, skiprows=skip_header, dtype=np.float64, ndmin=1)
+
+def compare_files(first_path, second_path=None, tolerance=0.0, delimiter=",", skip_header=0):
+    """
+    Compare columns read from files
+    
+    With one file, its first two columns are compared; with two files,
+    the first column of each.
+    
+    Returns:
+        BatchComparison: See compare_batch
+    """
+    if second_path is None:
+        first, second = np.loadtxt(first_path, delimiter=delimiter, usecols=(0, 1), skiprows=skip_header,
+                                   dtype=np.float64, ndmin=2, unpack=True)
+    else:
+        first = load_column(first_path, delimiter=delimiter, skip_header=skip_header)
+        second = load_column(second_path, delimiter=delimiter, skip_header=skip_header)
+    return compare_batch(first, second, tolerance)
+
+def run_batch(argv=None):
+    """Command-line entry point for comparing columns from files"""
+    parser = argparse.ArgumentParser(description="Compare two aligned numeric columns")
+    parser.add_argument("files", nargs="+", help="One file with two columns, or two single-column files")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="Largest difference counted as equal")
+    parser.add_argument("--delimiter", default=",")
+    parser.add_argument("--skip-header", type=int, default=0)
+    parser.add_argument("--messages", type=int, default=0, metavar="N", help="Print sentences for the first N rows")
+    parser.add_argument("--output", help="Save sign/abs_diff/equal columns (.npz, otherwise CSV)")
+    args = parser.parse_args(argv)
+    if len(args.files) > 2:
+        parser.error("give one file with two columns or two single-column files")
+    
+    result = compare_files(*args.files, tolerance=args.tolerance,
+                           delimiter=args.delimiter, skip_header=args.skip_header)
+    
+    for message in result.messages(stop=args.messages):
+        print(message)
+    print(result.summary())
+    
+    if args.output and args.output.endswith(".npz"):
+        np.savez(args.output, sign=result.sign, abs_diff=result.abs_diff, equal=result.equal)
+    elif args.output:
+        np.savetxt(args.output, np.column_stack([result.sign, result.abs_diff, result.equal]),
+                   delimiter=",", fmt=["%d", "%.17g", "%d"], header="sign,abs_diff,equal", comments="")
 
 def get_number_input(prompt):
     """
@@ -35,6 +213,10 @@ def get_number_input(prompt):
 
 # Main program
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_batch()
+        sys.exit(0)
+    
     print("Number Comparison Program")
     print("-" * 25)
     
@@ -48,11 +230,4 @@ if __name__ == "__main__":
     
     # Additional comparison details
     print("\nDetailed comparison:")
-    if first_number > second_number:
-        difference = first_number - second_number
-        print(f"• {first_number} is larger by {difference}")
-    elif first_number < second_number:
-        difference = second_number - first_number
-        print(f"• {second_number} is larger by {difference}")
-    else:
-        print("• Both numbers are identical")
\ No newline at end of file
+    print(f"• {describe_difference(first_number, second_number)}")
\ No newline at end of file
@@ -1,10 +1,180 @@
-# Ask user for inputs
-name = input("What is your name? ")
-age = input("How old are you? ")
-favorite_color = input("What is your favorite color? ")
+import argparse
+import csv
+import json
+import string
+import sys
+from functools import lru_cache
+from operator import itemgetter
 
-# Create a personalized message
-message = f"Hello {name}! You're {age} years old and love the color {favorite_color}. That's awesome!"
+DEFAULT_TEMPLATE = "Hello {name}! You're {age} years old and love the color {favorite_color}. That's awesome!"
 
-# Print the message
-print("\n" + message)
+class CompiledTemplate:
+    """
+    A message template parsed once and rendered for many rows.
+
+    Fields are written as {field}. The template is turned into a single
+    %-format string and an itemgetter, so rendering a row is two C calls
+    and no re-parsing.
+    """
+
+    def __init__(self, template):
+        parts = []
+        fields = []
+        for literal, field, spec, conversion in string.Formatter().parse(template):
+            parts.append(literal.replace("%", "%%"))
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion:
+                raise ValueError(f"Unsupported placeholder {{{field}{'!' + conversion if conversion else ''}"
+                                 f"{':' + spec if spec else ''}}}; use plain {{field}} names")
+            parts.append("%s")
+            fields.append(field)
+
+        self.template = template
+        self.fields = tuple(dict.fromkeys(fields))
+        self._format = "".join(parts)
+        self._get = itemgetter(*fields) if fields else (lambda row: ())
+        self._single = len(fields) == 1
+
+    def validate(self, row):
+        """
+        Check that a row can be rendered.
+
+        Returns:
+            str: The problem, or None if the row is valid
+        """
+        missing = [field for field in self.fields if field not in row]
+        if missing:
+            return f"missing field(s): {', '.join(missing)}"
+        empty = [field for field in self.fields if row[field] is None or str(row[field]).strip() == ""]
+        if empty:
+            return f"empty field(s): {', '.join(empty)}"
+        return None
+
+    def render(self, row):
+        """Render the template for one row (a dict of field values)"""
+        values = self._get(row)
+        return self._format % ((values,) if self._single else values)
+
+@lru_cache(maxsize=64)
+def compile_template(template):
+    """
+    Compile a template, reusing earlier compilations.
+
+    Raises:
+        ValueError: If a placeholder is not a plain {field}
+    """
+    return CompiledTemplate(template)
+
+def build_greeting(name, age, favorite_color):
+    """Create the personalized message for one person"""
+    return compile_template(DEFAULT_TEMPLATE).render(
+        {"name": name, "age": age, "favorite_color": favorite_color}
+    )
+
+def iter_rows(path, input_format=None):
+    """
+    Stream rows from a CSV (with a header) or JSONL file.
+
+    Yields:
+        tuple: (line_number, row dict or None, error or None)
+    """
+    input_format = input_format or ("jsonl" if str(path).endswith((".jsonl", ".ndjson")) else "csv")
+    with open(path, newline="", encoding="utf-8") as f:
+        if input_format == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row, None
+            return
+
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"invalid JSON: {e.msg}"
+                continue
+            if isinstance(row, dict):
+                yield line_number, row, None
+            else:
+                yield line_number, None, "expected a JSON object"
+
+def merge(template, rows, output, errors=None, flush_every=10000):
+    """
+    Render a compiled template for every row, skipping and reporting bad rows.
+
+    Args:
+        template (CompiledTemplate): Compiled message template
+        rows: Iterable of (line_number, row, error) as from iter_rows
+        output: Text file receiving one message per line
+        errors: Optional text file receiving one JSON error record per bad row
+        flush_every (int): Messages collected before each buffered write
+
+    Returns:
+        dict: rendered and rejected counts
+    """
+    render = template.render
+    validate = template.validate
+    buffer = []
+    rendered = rejected = 0
+
+    for line_number, row, error in rows:
+        if error is None:
+            error = validate(row)
+        if error is None:
+            buffer.append(render(row))
+            if len(buffer) >= flush_every:
+                output.write("\n".join(buffer) + "\n")
+                rendered += len(buffer)
+                buffer.clear()
+        else:
+            rejected += 1
+            if errors is not None:
+                errors.write(json.dumps({"line": line_number, "error": error}) + "\n")
+
+    if buffer:
+        output.write("\n".join(buffer) + "\n")
+        rendered += len(buffer)
+    return {"rendered": rendered, "rejected": rejected}
+
+def run_bulk(argv=None):
+    """Command-line entry point for rendering greetings from a file"""
+    parser = argparse.ArgumentParser(description="Render personalized greetings for every row of a file")
+    parser.add_argument("--input", required=True, help="CSV with a header, or JSONL")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Input format (default: from the extension)")
+    parser.add_argument("--template", default=DEFAULT_TEMPLATE, help="Message template with {field} placeholders")
+    parser.add_argument("--output", help="Output file (default: stdout)")
+    parser.add_argument("--errors", help="Write bad rows as JSON lines to this file (default: stderr)")
+    args = parser.parse_args(argv)
+
+    template = compile_template(args.template)
+    output = open(args.output, "w", encoding="utf-8", buffering=1 << 20) if args.output else sys.stdout
+    errors = open(args.errors, "w", encoding="utf-8") if args.errors else sys.stderr
+    try:
+        summary = merge(template, iter_rows(args.input, args.format), output, errors)
+    finally:
+        if args.output:
+            output.close()
+        if args.errors:
+            errors.close()
+
+    print(f"Rendered {summary['rendered']} greeting(s), rejected {summary['rejected']} row(s)", file=sys.stderr)
+
+def main():
+    # Ask user for inputs
+    name = input("What is your name? ")
+    age = input("How old are you? ")
+    favorite_color = input("What is your favorite color? ")
+
+    # Create a personalized message
+    message = build_greeting(name, age, favorite_color)
+
+    # Print the message
+    print("\n" + message)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_bulk()
+    else:
+        main()
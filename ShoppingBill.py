@@ -1,22 +1,241 @@
 # Program 3: Calculate total cost of 3 items including tax
 
-# Input prices for 3 items
-item1 = float(input("Enter price of item 1: ₹"))
-item2 = float(input("Enter price of item 2: ₹"))
-item3 = float(input("Enter price of item 3: ₹"))
+import argparse
+import csv
+import io
+import sys
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 
-# Input tax percentage
-tax_percent = float(input("Enter tax percentage: "))
+from batch_utils import parallel_map
 
-# Total without tax
-subtotal = item1 + item2 + item3
+CENT = Decimal("0.01")
+HUNDRED = Decimal(100)
+# Prices, quantities and tax rates in bulk files must be below this, so
+# that order totals stay within Decimal's 28-digit precision
+MAX_AMOUNT = Decimal(10) ** 12
 
-# Calculate tax
-tax = (tax_percent / 100) * subtotal
+def round_money(amount):
+    """Round a Decimal amount to paise/cents, halves away from zero"""
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
 
-# Final total
-total = subtotal + tax
+def compute_bill(prices, tax_percent):
+    """
+    Calculate the bill for a list of item prices at one tax rate.
 
-print(f"\nSubtotal: ₹{subtotal:.2f}")
-print(f"Tax (@{tax_percent}%): ₹{tax:.2f}")
-print(f"Total amount to pay: ₹{total:.2f}")
+    Args:
+        prices (list): Item prices as Decimal, str or int
+        tax_percent: Tax percentage as Decimal, str or int
+
+    Returns:
+        tuple: (subtotal, tax, total) as Decimal, tax and total rounded to 0.01
+    """
+    # Total without tax
+    subtotal = sum((Decimal(price) for price in prices), Decimal(0))
+
+    # Calculate tax
+    tax = round_money(subtotal * Decimal(tax_percent) / HUNDRED)
+
+    # Final total
+    return subtotal, tax, round_money(subtotal + tax)
+
+def format_bill(subtotal, tax, total, tax_percent):
+    """Return the subtotal, tax and total lines of a bill"""
+    return [
+        f"Subtotal: ₹{round_money(subtotal)}",
+        f"Tax (@{tax_percent}%): ₹{tax}",
+        f"Total amount to pay: ₹{total}"
+    ]
+
+def bill_order(items):
+    """
+    Calculate one order whose line items may use different tax rates.
+
+    Tax is computed once per rate on that rate's subtotal and rounded,
+    as on a tax invoice.
+
+    Args:
+        items (list): (price, quantity, tax_percent) Decimal tuples
+
+    Returns:
+        tuple: (subtotal, tax, total, {tax_percent: (subtotal, tax)}), amounts rounded to 0.01
+    """
+    subtotals = defaultdict(Decimal)
+    for price, quantity, tax_percent in items:
+        subtotals[tax_percent] += price * quantity
+
+    by_rate = {}
+    for tax_percent, rate_subtotal in subtotals.items():
+        rate_subtotal, rate_tax, _ = compute_bill([rate_subtotal], tax_percent)
+        by_rate[tax_percent] = (round_money(rate_subtotal), rate_tax)
+
+    subtotal = sum((rate_subtotal for rate_subtotal, _ in by_rate.values()), Decimal(0))
+    tax = sum((rate_tax for _, rate_tax in by_rate.values()), Decimal(0))
+    return round_money(subtotal), round_money(tax), round_money(subtotal + tax), by_rate
+
+def _parse_amount(value):
+    """Decimal for a CSV cell; rejects inf, NaN and amounts of MAX_AMOUNT or more"""
+    amount = Decimal(value)
+    if not amount.is_finite() or abs(amount) >= MAX_AMOUNT:
+        raise ValueError(f"{value!r} is not an amount below {MAX_AMOUNT}")
+    return amount
+
+def _parse_item(row, columns):
+    price = _parse_amount(row[columns["price"]])
+    quantity = _parse_amount(row[columns["quantity"]]) if "quantity" in columns and row[columns["quantity"]] else Decimal(1)
+    # Same key for "18" and "18.00", and never exponent notation such as 1E+1
+    tax_percent = Decimal(format(_parse_amount(row[columns["tax_percent"]]).normalize(), "f"))
+    return price, quantity, tax_percent
+
+def _bill_batch(task):
+    """Bill a batch of complete orders; runs in a worker process"""
+    columns, orders = task
+    lines = io.StringIO()
+    writer = csv.writer(lines, lineterminator="\n")
+    rate_totals = defaultdict(lambda: [Decimal(0), Decimal(0)])
+    errors = 0
+
+    for order_id, rows in orders:
+        items = []
+        for line_number, row in rows:
+            try:
+                items.append(_parse_item(row, columns))
+            except (InvalidOperation, ValueError, IndexError):
+                writer.writerow([order_id, "", "", "", f"invalid item on line {line_number}"])
+                errors += 1
+                break
+        else:
+            try:
+                subtotal, tax, total, by_rate = bill_order(items)
+            except InvalidOperation:
+                # The order's total is too large to round to cents
+                writer.writerow([order_id, "", "", "", "order total out of range"])
+                errors += 1
+                continue
+            writer.writerow([order_id, subtotal, tax, total, ""])
+            for tax_percent, (rate_subtotal, rate_tax) in by_rate.items():
+                rate_totals[tax_percent][0] += rate_subtotal
+                rate_totals[tax_percent][1] += rate_tax
+
+    return lines.getvalue(), dict(rate_totals), len(orders), errors
+
+def iter_order_batches(reader, columns, batch_rows=20000):
+    """
+    Group consecutive rows with the same order_id into orders, and orders into batches.
+
+    Rows of one order must be contiguous. A batch is closed only at an
+    order boundary, so no order is split across workers.
+
+    Yields:
+        tuple: (columns, [(order_id, [(line_number, row), ...]), ...])
+    """
+    order_column = columns["order_id"]
+    batch, batch_size = [], 0
+    current_id, current_rows = None, []
+
+    for line_number, row in enumerate(reader, 2):
+        if not row:
+            continue
+        order_id = row[order_column]
+        if order_id != current_id and current_rows:
+            batch.append((current_id, current_rows))
+            batch_size += len(current_rows)
+            current_rows = []
+            if batch_size >= batch_rows:
+                yield columns, batch
+                batch, batch_size = [], 0
+        current_id = order_id
+        current_rows.append((line_number, row))
+
+    if current_rows:
+        batch.append((current_id, current_rows))
+    if batch:
+        yield columns, batch
+
+def bill_orders_file(path, output, workers=None, batch_rows=20000):
+    """
+    Stream an orders CSV and write one billed line per order.
+
+    The file needs a header with order_id, price and tax_percent columns
+    and may have a quantity column (default 1). Memory use is bounded by
+    the batches in flight, not by the file size.
+
+    Args:
+        path (str): Orders CSV
+        output: Text file for order_id,subtotal,tax,total,error lines
+        workers (int): Worker processes (default: CPU count)
+        batch_rows (int): Approximate rows per worker task
+
+    Returns:
+        dict: orders, errors and per-tax-rate subtotal/tax/total
+    """
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = [name.strip() for name in next(reader)]
+        columns = {name: i for i, name in enumerate(header)}
+        missing = {"order_id", "price", "tax_percent"} - set(columns)
+        if missing:
+            raise ValueError(f"Missing column(s): {', '.join(sorted(missing))}")
+
+        csv.writer(output, lineterminator="\n").writerow(["order_id", "subtotal", "tax", "total", "error"])
+        rate_totals = defaultdict(lambda: [Decimal(0), Decimal(0)])
+        orders = errors = 0
+
+        for text, batch_rates, batch_orders, batch_errors in parallel_map(
+            _bill_batch, iter_order_batches(reader, columns, batch_rows), workers=workers
+        ):
+            output.write(text)
+            orders += batch_orders
+            errors += batch_errors
+            for tax_percent, (subtotal, tax) in batch_rates.items():
+                rate_totals[tax_percent][0] += subtotal
+                rate_totals[tax_percent][1] += tax
+
+    return {
+        "orders": orders,
+        "errors": errors,
+        "by_tax_rate": {
+            str(tax_percent): {"subtotal": str(subtotal), "tax": str(tax), "total": str(subtotal + tax)}
+            for tax_percent, (subtotal, tax) in sorted(rate_totals.items())
+        }
+    }
+
+def run_bulk(argv=None):
+    """Command-line entry point for billing an orders file"""
+    parser = argparse.ArgumentParser(description="Bill every order in an orders CSV")
+    parser.add_argument("orders", help="CSV with order_id, price, tax_percent and optional quantity columns; "
+                                       "all rows of one order must be on consecutive lines")
+    parser.add_argument("--output", help="Billed orders CSV (default: stdout)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    if args.output:
+        with open(args.output, "w", buffering=1 << 20) as output:
+            summary = bill_orders_file(args.orders, output, workers=args.workers)
+    else:
+        summary = bill_orders_file(args.orders, sys.stdout, workers=args.workers)
+
+    report = sys.stdout if args.output else sys.stderr
+    print(f"\nOrders: {summary['orders']} (errors: {summary['errors']})", file=report)
+    for tax_percent, totals in summary["by_tax_rate"].items():
+        print(f"Tax @{tax_percent}%: subtotal ₹{totals['subtotal']}, tax ₹{totals['tax']}, total ₹{totals['total']}",
+              file=report)
+
+def main():
+    # Input prices for 3 items
+    item1 = Decimal(input("Enter price of item 1: ₹"))
+    item2 = Decimal(input("Enter price of item 2: ₹"))
+    item3 = Decimal(input("Enter price of item 3: ₹"))
+
+    # Input tax percentage
+    tax_percent = Decimal(input("Enter tax percentage: "))
+
+    subtotal, tax, total = compute_bill([item1, item2, item3], tax_percent)
+
+    print("\n" + "\n".join(format_bill(subtotal, tax, total, tax_percent)))
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_bulk()
+    else:
+        main()
@@ -0,0 +1,43 @@
+"""
+Bulk billing tests for ShoppingBill. Run with:
+    python -m pytest -q ShoppingBill_Test.py
+"""
+import csv
+import io
+
+from ShoppingBill import bill_orders_file
+
+def bill(tmp_path, text):
+    path = tmp_path / "orders.csv"
+    path.write_text(text)
+    output = io.StringIO()
+    summary = bill_orders_file(str(path), output, workers=1)
+    return list(csv.reader(io.StringIO(output.getvalue()))), summary
+
+def test_quoted_order_id_round_trips(tmp_path):
+    rows, summary = bill(tmp_path, 'order_id,price,tax_percent\n"B,2",99.99,10\n')
+
+    assert rows == [["order_id", "subtotal", "tax", "total", "error"], ["B,2", "99.99", "10.00", "109.99", ""]]
+    assert summary["errors"] == 0
+
+def test_non_finite_amounts_are_error_rows(tmp_path):
+    rows, summary = bill(tmp_path, "order_id,price,tax_percent\nA,inf,10\nB,NaN,10\nC,1,-Infinity\nD,5,10\n")
+
+    assert [row[0] for row in rows[1:]] == ["A", "B", "C", "D"]
+    assert all(row[4] == "invalid item on line 2" for row in rows[1:2])
+    assert all(row[4].startswith("invalid item") for row in rows[1:4])
+    assert rows[4] == ["D", "5.00", "0.50", "5.50", ""]
+    assert summary["errors"] == 3
+
+def test_out_of_range_amounts_are_error_rows(tmp_path):
+    rows, summary = bill(tmp_path, (
+        "order_id,price,quantity,tax_percent\n"
+        "A,1e30,1,10\n"
+        "B,999999999999,999999999999,999999999999\n"
+        "C,5,1,10\n"
+    ))
+
+    assert rows[1] == ["A", "", "", "", "invalid item on line 2"]
+    assert rows[2] == ["B", "", "", "", "order total out of range"]
+    assert rows[3] == ["C", "5.00", "0.50", "5.50", ""]
+    assert summary["errors"] == 2
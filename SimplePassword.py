@@ -1,3 +1,50 @@
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import string
+import struct
+import sys
+import tempfile
+from array import array
+from collections import Counter
+from contextlib import ExitStack
+from functools import lru_cache
+from multiprocessing import parent_process
+from multiprocessing.util import Finalize
+
+from batch_utils import iter_chunks, parallel_map
+
+# Failure bits returned by PasswordPolicy.evaluate (0 means the password passed)
+RULE_LENGTH = 1
+RULE_LOWERCASE = 2
+RULE_UPPERCASE = 4
+RULE_DIGIT = 8
+RULE_SYMBOL = 16
+RULE_REPEAT = 32
+RULE_BREACHED = 64
+
+RULE_NAMES = {
+    RULE_LENGTH: "length",
+    RULE_LOWERCASE: "lowercase",
+    RULE_UPPERCASE: "uppercase",
+    RULE_DIGIT: "digit",
+    RULE_SYMBOL: "symbol",
+    RULE_REPEAT: "repeat",
+    RULE_BREACHED: "breached"
+}
+
+CHARACTER_CLASSES = {
+    RULE_LOWERCASE: frozenset(string.ascii_lowercase),
+    RULE_UPPERCASE: frozenset(string.ascii_uppercase),
+    RULE_DIGIT: frozenset(string.digits),
+    RULE_SYMBOL: frozenset(string.punctuation)
+}
+
 def check_password_length(password, min_length=8):
     """
     Check if a password meets the minimum length requirement.
@@ -11,24 +58,392 @@ def check_password_length(password, min_length=8):
     """
     return len(password) >= min_length
 
-def validate_password_with_feedback(password, min_length=8):
+def validate_password_with_feedback(password, min_length=8, breach_index=None):
     """
     Check password length and provide feedback message.
     
     Args:
         password (str): The password to check
         min_length (int): Minimum required length (default: 8)
+        breach_index (BreachIndex): Optional index of breached passwords
+            to reject (default: None, length only)
     
     Returns:
         tuple: (is_valid, feedback_message)
     """
-    if len(password) >= min_length:
-        return True, f"Password is valid! Length: {len(password)} characters"
-    else:
+    if len(password) < min_length:
         return False, f"Password too short! Current: {len(password)}, Required: {min_length}"
+    if breach_index is not None and password in breach_index:
+        return False, "Password found in a known breach list! Choose a different one"
+    return True, f"Password is valid! Length: {len(password)} characters"
+
+# --- Breached-password index ---
+#
+# <prefix>.hashes holds the SHA-1 digests of every breached password as
+# sorted, deduplicated 20-byte records. <prefix>.bloom is a Bloom filter
+# over the same digests, so most lookups of passwords that are not in the
+# list end after a few bit tests, before any binary search.
+
+DIGEST_SIZE = 20
+BLOOM_HEADER = struct.Struct("<4sQI")
+BLOOM_MAGIC = b"BLM1"
+
+def password_digest(password):
+    """Return the SHA-1 digest used as the index key for a password"""
+    return hashlib.sha1(password.encode("utf-8", "surrogateescape")).digest()
+
+def _bloom_positions(digest, num_bits, num_hashes):
+    # Kirsch-Mitzenmacher double hashing from two halves of the digest
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:16], "little") | 1
+    return [(h1 + i * h2) % num_bits for i in range(num_hashes)]
+
+def _iter_breach_digests(path, source_format):
+    for line in iter_password_file(path):
+        if not line:
+            continue
+        if source_format == "sha1":
+            # Accepts plain hex digests and "HASH:COUNT" lines
+            yield bytes.fromhex(line.split(":", 1)[0].strip())
+        else:
+            yield password_digest(line)
+
+def _iter_records(f):
+    while True:
+        record = f.read(DIGEST_SIZE)
+        if not record:
+            return
+        yield record
+
+def build_breach_index(source, prefix, source_format="plain", false_positive_rate=0.001, run_size=2_000_000):
+    """
+    Build <prefix>.hashes and <prefix>.bloom from a breach list.
+    
+    The list is hashed and sorted in runs of run_size entries, and the
+    runs are merged on disk, so memory use does not grow with the list.
+    
+    Args:
+        source (str): Breach list, one entry per line
+        prefix (str): Output path prefix
+        source_format (str): "plain" for passwords, "sha1" for hex SHA-1
+            digests (optionally "HASH:COUNT", as in HIBP downloads)
+        false_positive_rate (float): Target Bloom filter false-positive rate
+        run_size (int): Entries sorted in memory at a time
+    
+    Returns:
+        int: Number of distinct breached passwords indexed
+    """
+    workdir = os.path.dirname(os.path.abspath(prefix))
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp, ExitStack() as stack:
+        runs = []
+        total = 0
+        for chunk in iter_chunks(_iter_breach_digests(source, source_format), run_size):
+            chunk.sort()
+            run_path = os.path.join(tmp, f"run{len(runs)}")
+            with open(run_path, "wb") as run:
+                run.write(b"".join(chunk))
+            runs.append(run_path)
+            total += len(chunk)
+        
+        # Size the filter for the worst case of no duplicates
+        num_bits = max(8, math.ceil(-max(total, 1) * math.log(false_positive_rate) / math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / max(total, 1) * math.log(2)))
+        
+        bloom_file = stack.enter_context(open(prefix + ".bloom", "w+b"))
+        bloom_file.truncate(BLOOM_HEADER.size + (num_bits + 7) // 8)
+        bloom = stack.enter_context(mmap.mmap(bloom_file.fileno(), 0))
+        bloom[:BLOOM_HEADER.size] = BLOOM_HEADER.pack(BLOOM_MAGIC, num_bits, num_hashes)
+        
+        readers = [_iter_records(stack.enter_context(open(run_path, "rb"))) for run_path in runs]
+        unique = 0
+        previous = None
+        with open(prefix + ".hashes", "wb", buffering=1 << 20) as hashes:
+            for digest in heapq.merge(*readers):
+                if digest == previous:
+                    continue
+                previous = digest
+                hashes.write(digest)
+                for position in _bloom_positions(digest, num_bits, num_hashes):
+                    bloom[BLOOM_HEADER.size + (position >> 3)] |= 1 << (position & 7)
+                unique += 1
+        bloom.flush()
+    
+    return unique
+
+class BreachIndex:
+    """
+    Read-only, memory-mapped view of an index built by build_breach_index.
+    
+    Nothing is loaded into RAM up front; the OS pages in only the parts
+    of the files that lookups touch, and processes share those pages.
+    
+    Usage:
+        with BreachIndex("breaches") as index:
+            "password" in index
+    """
+    
+    def __init__(self, prefix):
+        self.prefix = prefix
+        with ExitStack() as stack:
+            bloom_file = stack.enter_context(open(prefix + ".bloom", "rb"))
+            self._bloom = mmap.mmap(bloom_file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.num_bits, self.num_hashes = BLOOM_HEADER.unpack_from(self._bloom)
+            if magic != BLOOM_MAGIC:
+                self._bloom.close()
+                raise ValueError(f"{prefix}.bloom is not a breach index Bloom filter")
+            
+            hashes_file = stack.enter_context(open(prefix + ".hashes", "rb"))
+            size = os.fstat(hashes_file.fileno()).st_size
+            self.count = size // DIGEST_SIZE
+            self._hashes = mmap.mmap(hashes_file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+    
+    def __reduce__(self):
+        # Reopen (and re-map) in worker processes instead of pickling the maps
+        return (BreachIndex, (self.prefix,))
+    
+    def __len__(self):
+        return self.count
+    
+    def __contains__(self, password):
+        return self.contains_digest(password_digest(password))
+    
+    def contains_digest(self, digest):
+        """Check a SHA-1 digest: Bloom filter first, then binary search"""
+        bloom = self._bloom
+        offset = BLOOM_HEADER.size
+        for position in _bloom_positions(digest, self.num_bits, self.num_hashes):
+            if not bloom[offset + (position >> 3)] & (1 << (position & 7)):
+                return False
+        
+        hashes = self._hashes
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record = hashes[middle * DIGEST_SIZE:(middle + 1) * DIGEST_SIZE]
+            if record < digest:
+                low = middle + 1
+            elif record > digest:
+                high = middle
+            else:
+                return True
+        return False
+    
+    def close(self):
+        self._bloom.close()
+        if self.count:
+            self._hashes.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class PasswordPolicy:
+    """
+    A multi-rule password policy compiled once and applied to many passwords.
+    
+    Only the enabled rules are compiled into the check, and each password
+    is scanned once into a character set that every class rule reuses.
+    
+    A policy with a breach index keeps it mapped until close(); use it as
+    a context manager:
+        with PasswordPolicy(breach_index="breaches") as policy:
+            policy.evaluate("password")
+    """
+    
+    def __init__(self, min_length=8, require=("lowercase", "uppercase", "digit"), max_repeat=3,
+                 breach_index=None):
+        """
+        Args:
+            min_length (int): Minimum required length (default: 8)
+            require (iterable): Character classes that must appear, from
+                "lowercase", "uppercase", "digit" and "symbol"
+            max_repeat (int): Longest allowed run of one character, or None
+                to allow any run (default: 3)
+            breach_index (str): Optional BreachIndex path prefix; passwords
+                found in it fail the "breached" rule
+        """
+        names = {RULE_NAMES[bit]: bit for bit in CHARACTER_CLASSES}
+        unknown = set(require) - set(names)
+        if unknown:
+            raise ValueError(f"Unknown character class(es): {', '.join(sorted(unknown))}")
+        
+        self.min_length = min_length
+        self.require = tuple(require)
+        self.max_repeat = max_repeat
+        self._classes = [(names[name], CHARACTER_CLASSES[names[name]]) for name in self.require]
+        self._repeat = re.compile(r"(.)\1{%d}" % max_repeat, re.DOTALL).search if max_repeat else None
+        self.breach_index = breach_index
+        self._index = BreachIndex(breach_index) if breach_index else None
+        self._breached = self._index.__contains__ if self._index else None
+    
+    def __reduce__(self):
+        # Rebuild from the arguments so the policy can be sent to worker processes
+        return (PasswordPolicy, (self.min_length, self.require, self.max_repeat, self.breach_index))
+    
+    def close(self):
+        """Unmap the breach index, if any; evaluate() fails for the policy afterwards"""
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def evaluate(self, password):
+        """
+        Apply every rule to one password.
+        
+        Returns:
+            int: Bitwise OR of the RULE_* bits that failed (0 if valid)
+        """
+        failed = RULE_LENGTH if len(password) < self.min_length else 0
+        chars = set(password)
+        for bit, members in self._classes:
+            if chars.isdisjoint(members):
+                failed |= bit
+        if self._repeat and self._repeat(password):
+            failed |= RULE_REPEAT
+        if self._breached and self._breached(password):
+            failed |= RULE_BREACHED
+        return failed
+
+def describe_failures(failed):
+    """Return the rule names set in a failure bitmask"""
+    return [name for bit, name in RULE_NAMES.items() if failed & bit]
+
+@lru_cache(maxsize=None)
+def _result_fields(failed):
+    # There are only 128 possible masks, so each JSON fragment is built once
+    return f'"valid": {json.dumps(not failed)}, "failed": {json.dumps(describe_failures(failed))}'
+
+_worker_policy = None
+
+def _init_worker(policy):
+    global _worker_policy
+    _worker_policy = policy
+    if parent_process() is not None:
+        # The policy was unpickled into this worker and reopened its breach
+        # index; close it when the worker exits
+        Finalize(policy, policy.close, exitpriority=0)
+
+def _evaluate_chunk(passwords):
+    evaluate = _worker_policy.evaluate
+    return array("B", map(evaluate, passwords))
+
+def iter_password_file(path):
+    """Stream passwords from a file, one per line, without loading it"""
+    # surrogateescape keeps undecodable bytes instead of failing the whole export
+    with open(path, encoding="utf-8", errors="surrogateescape", newline="\n") as f:
+        for line in f:
+            yield line.rstrip("\r\n")
+
+def audit_passwords(passwords, policy=None, workers=None, chunk_size=50000, output=None):
+    """
+    Check a stream of passwords against a policy across worker processes.
+    
+    Args:
+        passwords: Iterable of passwords, e.g. iter_password_file(path)
+        policy (PasswordPolicy): Policy to apply (default: PasswordPolicy())
+        workers (int): Worker processes (default: CPU count)
+        chunk_size (int): Passwords sent to a worker per task
+        output: Optional text file; one JSON object per password is written
+            with its line number and failed rules, never the password itself
+    
+    Returns:
+        dict: Totals plus the number of passwords failing each rule
+    """
+    if policy is None:
+        with PasswordPolicy() as policy:
+            return audit_passwords(passwords, policy, workers, chunk_size, output)
+    masks = Counter()
+    line_number = 0
+    
+    results = parallel_map(
+        _evaluate_chunk,
+        iter_chunks(passwords, chunk_size),
+        workers=workers,
+        initializer=_init_worker,
+        initargs=(policy,)
+    )
+    for chunk_masks in results:
+        if output is not None:
+            output.writelines(
+                f'{{"line": {line_number + i}, {_result_fields(failed)}}}\n'
+                for i, failed in enumerate(chunk_masks, 1)
+            )
+        line_number += len(chunk_masks)
+        # Count distinct masks (at most 128) rather than one entry per password
+        masks.update(chunk_masks)
+    
+    return {
+        "total": line_number,
+        "valid": masks[0],
+        "invalid": line_number - masks[0],
+        "failed_by_rule": {
+            name: sum(count for failed, count in masks.items() if failed & bit)
+            for bit, name in RULE_NAMES.items()
+        }
+    }
+
+def parse_args(argv=None):
+    """Parse the command line for bulk auditing, index building and the interactive checker"""
+    parser = argparse.ArgumentParser(description="Check passwords against a length/character policy and breach lists")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--bulk", metavar="FILE", help="Audit a password file, one per line")
+    mode.add_argument("--build-index", metavar="BREACH_LIST", help="Build a breach index from a breach list")
+    parser.add_argument("--index", metavar="PREFIX", help="Breach index path prefix to build or check against")
+    parser.add_argument("--source-format", choices=["plain", "sha1"], default="plain",
+                        help="Breach list format for --build-index")
+    parser.add_argument("--min-length", type=int, default=8)
+    parser.add_argument("--require", default="lowercase,uppercase,digit",
+                        help="Comma-separated classes: lowercase, uppercase, digit, symbol (empty for none)")
+    parser.add_argument("--max-repeat", type=int, default=3, help="Longest allowed run of one character (0 to disable)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", help="Write per-line JSON results to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+    if args.build_index and not args.index:
+        parser.error("--build-index requires --index PREFIX")
+    return args
+
+def run_bulk(args):
+    """Audit the password file named by args.bulk and print the summary"""
+    policy = PasswordPolicy(
+        min_length=args.min_length,
+        require=[name for name in args.require.split(",") if name],
+        max_repeat=args.max_repeat or None,
+        breach_index=args.index
+    )
+    passwords = iter_password_file(args.bulk)
+    
+    with policy:
+        if args.output == "-":
+            summary = audit_passwords(passwords, policy, workers=args.workers, output=sys.stdout)
+        elif args.output:
+            with open(args.output, "w", buffering=1 << 20) as output:
+                summary = audit_passwords(passwords, policy, workers=args.workers, output=output)
+        else:
+            summary = audit_passwords(passwords, policy, workers=args.workers)
+    
+    print(json.dumps(summary, indent=2), file=sys.stderr if args.output == "-" else sys.stdout)
 
 # Example usage
 if __name__ == "__main__":
+    args = parse_args()
+    if args.build_index:
+        count = build_breach_index(args.build_index, args.index, source_format=args.source_format)
+        print(f"Indexed {count} breached passwords into {args.index}.hashes and {args.index}.bloom")
+        sys.exit(0)
+    if args.bulk:
+        run_bulk(args)
+        sys.exit(0)
+    
+    breach_index = BreachIndex(args.index) if args.index else None
+    
     # Test passwords
     test_passwords = [
         "123",
@@ -42,7 +457,7 @@ if __name__ == "__main__":
     print("-" * 40)
     
     for pwd in test_passwords:
-        is_valid, message = validate_password_with_feedback(pwd)
+        is_valid, message = validate_password_with_feedback(pwd, breach_index=breach_index)
         status = "✓ VALID" if is_valid else "✗ INVALID"
         print(f"{status}: '{pwd}' - {message}")
     
@@ -54,10 +469,15 @@ if __name__ == "__main__":
         if user_password.lower() == 'quit':
             break
         
-        is_valid, message = validate_password_with_feedback(user_password)
+        is_valid, message = validate_password_with_feedback(user_password, breach_index=breach_index)
         print(f"Result: {message}")
         
         if is_valid:
             print("🎉 Password meets length requirements!")
+        elif len(user_password) < 8:
+            print("❌ Password needs to be longer.")
         else:
-            print("❌ Password needs to be longer.")
\ No newline at end of file
+            print("❌ Password appears in a breach list.")
+    
+    if breach_index:
+        breach_index.close()
\ No newline at end of file
@@ -1,21 +1,245 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
 
 # Day 9/50 - AI Python Challenge
 # Sum Calculator : Find sum of all numbers from 1 to n using a loop.
 # Use filename as SumCalculator.py
 # Our Goal : Use any AI tool to generate the script and execute the script without issue
 
-def sum_using_loop(n):
-    """Calculate sum of numbers from 1 to n using a loop"""
+# Largest n whose prefix sums (and the intermediate n * (n + 1)) fit in int64
+MAX_SERIES_N = 3_000_000_000
+
+# Above this the verification loop is split across processes
+PARALLEL_THRESHOLD = 5_000_000
+
+# Points drawn per plot, whatever n is (first/min/max/last of budget // 4 buckets)
+DEFAULT_PLOT_BUDGET = 4000
+
+# Series elements generated at a time when streaming
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# Draw point markers only when every point fits comfortably
+MARKER_LIMIT = 200
+
+def sum_using_loop(n, start=1):
+    """Calculate sum of numbers from start to n using a loop"""
     total = 0
-    for i in range(1, n + 1):
+    for i in range(start, n + 1):
         total += i
     return total
 
+def sum_using_formula(n, start=1):
+    """Calculate sum of numbers from start to n with the closed form, in O(1)"""
+    if n < start:
+        return 0
+    return (start + n) * (n - start + 1) // 2
+
+def sum_using_cumsum(n, start=1):
+    """Calculate sum of numbers from start to n with a vectorized NumPy sum"""
+    if n < start:
+        return 0
+    return int(np.arange(start, n + 1, dtype=np.int64).sum())
+
+def sum_using_chunks(n, start=1, workers=None):
+    """Calculate sum of numbers from start to n by looping over chunks in parallel processes"""
+    if n < start:
+        return 0
+    workers = workers or os.cpu_count() or 1
+    step = -(-(n - start + 1) // workers)
+    starts = list(range(start, n + 1, step))
+    stops = [min(chunk_start + step - 1, n) for chunk_start in starts]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(sum_using_loop, stops, starts))
+
+STRATEGIES = {
+    "loop": sum_using_loop,
+    "formula": sum_using_formula,
+    "cumsum": sum_using_cumsum,
+    "chunks": sum_using_chunks
+}
+
+def select_strategy(n, purpose="sum"):
+    """
+    Pick the range-sum strategy for n.
+    
+    Args:
+        n (int): Upper end of the range
+        purpose (str): "sum" for the fastest answer, "verify" for an
+            independent loop-based check of the closed form
+    
+    Returns:
+        str: Key into STRATEGIES
+    """
+    if purpose == "verify":
+        return "chunks" if n > PARALLEL_THRESHOLD else "loop"
+    return "formula"
+
+def range_sum(n, start=1, strategy="auto"):
+    """
+    Calculate sum of numbers from start to n.
+    
+    Args:
+        n (int): Last number in the range
+        start (int): First number in the range (default: 1)
+        strategy (str): Key into STRATEGIES, or "auto"
+    
+    Returns:
+        int: The sum
+    """
+    if strategy == "auto":
+        strategy = select_strategy(n)
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}'. Choose from: {', '.join(STRATEGIES)}")
+    return STRATEGIES[strategy](n, start)
+
+def prefix_sum_series(n, strategy="formula"):
+    """
+    Calculate Sum(1 to i) for every i from 1 to n in a single O(n) pass.
+    
+    Args:
+        n (int): Length of the series
+        strategy (str): "formula" (i * (i + 1) / 2 per element) or "cumsum"
+    
+    Returns:
+        numpy.ndarray: int64 array where element i - 1 is Sum(1 to i)
+    """
+    if n > MAX_SERIES_N:
+        raise ValueError(f"n must be at most {MAX_SERIES_N} to fit the series in int64")
+    i = np.arange(1, n + 1, dtype=np.int64)
+    if strategy == "cumsum":
+        return np.cumsum(i)
+    if strategy == "formula":
+        return i * (i + 1) // 2
+    raise ValueError(f"Unknown series strategy '{strategy}'. Choose from: formula, cumsum")
+
+def verify_sum(n):
+    """
+    Check the closed form against an independent loop-based sum.
+    
+    Returns:
+        tuple: (loop_result, formula_result, results_match)
+    """
+    loop_result = range_sum(n, strategy=select_strategy(n, purpose="verify"))
+    formula_result = sum_using_formula(n)
+    return loop_result, formula_result, loop_result == formula_result
+
+def iter_prefix_sums(n, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream the series Sum(1 to i) for i from 1 to n in chunks.
+    
+    Yields:
+        tuple: (x_chunk, y_chunk) int64 arrays of at most chunk_size elements
+    """
+    if n > MAX_SERIES_N:
+        raise ValueError(f"n must be at most {MAX_SERIES_N} to fit the series in int64")
+    for start in range(1, n + 1, chunk_size):
+        i = np.arange(start, min(start + chunk_size, n + 1), dtype=np.int64)
+        yield i, i * (i + 1) // 2
+
+def _bucket_extremes(x, y, buckets, n):
+    """Keep the first, last, minimum and maximum point of every bucket"""
+    bucket_ids = (x - 1) * buckets // n
+    starts = np.flatnonzero(np.r_[True, bucket_ids[1:] != bucket_ids[:-1]])
+    ends = np.r_[starts[1:], len(x)] - 1
+    segment = np.repeat(np.arange(len(starts)), ends - starts + 1)
+
+    def first_match(mask):
+        positions = np.flatnonzero(mask)
+        _, first = np.unique(segment[positions], return_index=True)
+        return positions[first]
+
+    min_pos = first_match(y == np.minimum.reduceat(y, starts)[segment])
+    max_pos = first_match(y == np.maximum.reduceat(y, starts)[segment])
+    keep = np.unique(np.concatenate([starts, min_pos, max_pos, ends]))
+    return x[keep], y[keep]
+
+def downsample_min_max(chunks, n, budget=DEFAULT_PLOT_BUDGET):
+    """
+    Reduce a streamed series to at most `budget` points, preserving its shape.
+    
+    The x range 1..n is split into budget // 4 equal buckets, and only the
+    first, last, lowest and highest point of each bucket is kept (M4
+    aggregation), so peaks and the drawn line match the full series at
+    plot resolution. Memory use is one chunk plus O(budget).
+    
+    Args:
+        chunks: Iterable of (x, y) arrays with x increasing, covering 1..n
+        n (int): Largest x value
+        budget (int): Maximum number of points to return
+    
+    Returns:
+        tuple: (x, y) arrays of the kept points
+    """
+    buckets = max(1, min(budget // 4, n))
+    kept_x, kept_y = [], []
+    for x, y in chunks:
+        chunk_x, chunk_y = _bucket_extremes(x, y, buckets, n)
+        kept_x.append(chunk_x)
+        kept_y.append(chunk_y)
+
+    # Buckets that straddle a chunk boundary have candidates from both chunks
+    return _bucket_extremes(np.concatenate(kept_x), np.concatenate(kept_y), buckets, n)
+
+def draw_sum_plot(ax, x_values, y_values, n, result):
+    """Draw the Sum(1 to i) series and the final-result annotation on `ax`"""
+    marker = 'o' if len(x_values) <= MARKER_LIMIT else None
+    ax.plot(x_values, y_values, 'b-', linewidth=2, marker=marker, markersize=4)
+    ax.set_title(f'Sum of Numbers from 1 to i (where i goes from 1 to {n})')
+    ax.set_xlabel('n')
+    ax.set_ylabel('Sum (1 + 2 + ... + n)')
+    ax.grid(True, alpha=0.3)
+    
+    # Add annotation for the final result
+    ax.annotate(f'Sum(1 to {n}) = {result}', 
+                xy=(n, result), 
+                xytext=(n*0.7, result*0.8),
+                arrowprops=dict(arrowstyle='->', color='red'),
+                fontsize=12, 
+                bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow", alpha=0.7))
+
+def render_sum_plot(n, output_path, budget=DEFAULT_PLOT_BUDGET, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Render the Sum(1 to i) plot to a file without a display.
+    
+    The series is streamed and downsampled, and drawn on a bare Figure
+    (Agg canvas), so neither pyplot's GUI backend nor all n points are
+    ever needed.
+    
+    Args:
+        n (int): Length of the series
+        output_path (str): Image path; the format follows the extension
+        budget (int): Maximum number of points to draw
+        chunk_size (int): Series elements generated at a time
+    
+    Returns:
+        int: Number of points drawn
+    """
+    x_values, y_values = downsample_min_max(iter_prefix_sums(n, chunk_size), n, budget)
+    
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    draw_sum_plot(ax, x_values, y_values, n, sum_using_formula(n))
+    fig.tight_layout()
+    fig.savefig(output_path)
+    return len(x_values)
+
 def main():
+    parser = argparse.ArgumentParser(description="Sum of numbers from 1 to n")
+    parser.add_argument("--n", type=int, help="Positive integer n (prompted for if omitted)")
+    parser.add_argument("--output", help="Render the plot to this file instead of opening a window")
+    parser.add_argument("--budget", type=int, default=DEFAULT_PLOT_BUDGET, help="Maximum points to plot")
+    parser.add_argument("--no-verify", action="store_true", help="Skip the loop-based verification")
+    args = parser.parse_args()
+    
     # Get input from user
     try:
-        n = int(input("Enter a positive integer n: "))
+        n = args.n if args.n is not None else int(input("Enter a positive integer n: "))
         if n <= 0:
             print("Please enter a positive integer.")
             return
@@ -23,42 +247,30 @@ def main():
         print("Please enter a valid integer.")
         return
     
-    # Calculate sum using loop
-    result = sum_using_loop(n)
+    # Calculate sum
+    result = range_sum(n)
     print(f"Sum of numbers from 1 to {n} = {result}")
     
-    # Generate data for plotting
-    x_values = []
-    y_values = []
-    
-    # Calculate sums for values from 1 to n
-    for i in range(1, n + 1):
-        x_values.append(i)
-        y_values.append(sum_using_loop(i))
-    
-    # Create the plot
-    plt.figure(figsize=(10, 6))
-    plt.plot(x_values, y_values, 'b-', linewidth=2, marker='o', markersize=4)
-    plt.title(f'Sum of Numbers from 1 to i (where i goes from 1 to {n})')
-    plt.xlabel('n')
-    plt.ylabel('Sum (1 + 2 + ... + n)')
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    
-    # Add annotation for the final result
-    plt.annotate(f'Sum(1 to {n}) = {result}', 
-                xy=(n, result), 
-                xytext=(n*0.7, result*0.8),
-                arrowprops=dict(arrowstyle='->', color='red'),
-                fontsize=12, 
-                bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow", alpha=0.7))
+    if args.output:
+        points = render_sum_plot(n, args.output, budget=args.budget)
+        print(f"Plot of {points} points saved to {args.output}")
+    else:
+        # Stream and downsample the series so the window stays responsive for any n
+        x_values, y_values = downsample_min_max(iter_prefix_sums(n), n, args.budget)
+        
+        fig, ax = plt.subplots(figsize=(10, 6))
+        draw_sum_plot(ax, x_values, y_values, n, result)
+        fig.tight_layout()
+        plt.show()
     
-    plt.show()
+    if args.no_verify:
+        return
     
-    # Also show the mathematical formula verification
-    formula_result = n * (n + 1) // 2
+    # Also verify the formula against a loop (split across processes for large n)
+    loop_result, formula_result, match = verify_sum(n)
+    print(f"Sum using loop = {loop_result}")
     print(f"Verification using formula n(n+1)/2 = {formula_result}")
-    print(f"Results match: {result == formula_result}")
+    print(f"Results match: {match}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,60 @@
+# Helpers shared by the bulk modes of the root-level scripts
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+def iter_chunks(iterable, size):
+    """
+    Split an iterable into lists of at most `size` items.
+
+    Args:
+        iterable: Any iterable, consumed lazily
+        size (int): Items per chunk
+
+    Yields:
+        list: The next chunk
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def parallel_map(func, items, workers=None, window=None, initializer=None, initargs=()):
+    """
+    Apply `func` to every item across worker processes, yielding results in order.
+
+    Unlike Pool.map/imap, at most `window` tasks are submitted ahead of the
+    consumer, so a huge input is never read into memory all at once.
+    With workers=1 everything runs in the current process.
+
+    Args:
+        func: Picklable function taking one item
+        items: Iterable of picklable items
+        workers (int): Worker processes (default: CPU count)
+        window (int): Maximum tasks in flight (default: 2 * workers)
+        initializer: Called once in every worker before any task
+        initargs (tuple): Arguments for initializer
+
+    Yields:
+        The result of func(item) for each item, in input order
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        if initializer:
+            initializer(*initargs)
+        yield from map(func, items)
+        return
+
+    window = window or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()